@@ -0,0 +1,72 @@
+"""
+Scaling of tree assembly (core.hierarchy.build_tree) and rendering
+(core.cli.views.print_hierarchy) with subtree size.
+
+Builds synthetic 5-level org charts in memory, no database is needed.
+Time per node stays flat when assembly and rendering are linear.
+
+Usage (from app directory):
+    python -m benchmarks.hierarchy [max_size]
+"""
+
+import os
+import random
+import sys
+import time
+from core.cli.views import print_hierarchy
+from core.hierarchy import build_tree
+
+# Share of employees on each level below root, as in generated datasets
+LEVEL_SHARES = (0.002, 0.02, 0.2, 0.778)
+
+
+def node(id: int, manager_id: int | None) -> dict:
+    return {
+        "id": id,
+        "manager_id": manager_id,
+        "full_name": f"Employee {id}",
+        "position": "Position",
+        "subordinates": [],
+    }
+
+
+def make_nodes(size: int, seed: int = 0) -> list:
+    """Flat nodes of tree with size nodes, root ID is 1"""
+    rng = random.Random(seed)
+    nodes = [node(1, None)]
+    managers = [1]
+    next_id = 2
+    for share in LEVEL_SHARES:
+        count = max(1, int((size - 1) * share))
+        level = list(range(next_id, next_id + count))
+        nodes.extend(node(id, rng.choice(managers)) for id in level)
+        managers = level
+        next_id += count
+    rng.shuffle(nodes)
+    return nodes
+
+
+def main(max_size: int = 1_000_000):
+    print(
+        f"{'nodes':>10}{'build_tree, s':>16}{'per node, µs':>15}"
+        f"{'render, s':>12}{'per node, µs':>15}"
+    )
+    size = 1000
+    with open(os.devnull, "w") as devnull:
+        while size <= max_size:
+            nodes = make_nodes(size)
+            start = time.perf_counter()
+            root = build_tree(nodes, root_id=1, limit=len(nodes))
+            built = time.perf_counter() - start
+            start = time.perf_counter()
+            print_hierarchy(root, file=devnull)
+            rendered = time.perf_counter() - start
+            print(
+                f"{len(nodes):>10,}{built:>16.3f}{built / len(nodes) * 1e6:>15.2f}"
+                f"{rendered:>12.3f}{rendered / len(nodes) * 1e6:>15.2f}"
+            )
+            size *= 10
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]))
@@ -0,0 +1,76 @@
+"""
+Per-call latency of repeated listings and hierarchy lookups.
+
+Runs every scenario with server-side prepared statements disabled and with
+configured DB_PREPARE_THRESHOLD, against the database from settings.
+Listing cache is bypassed, so every call reaches the database.
+
+Usage (from app directory, on a filled database):
+    python -m benchmarks.queries [repeats]
+"""
+
+import statistics
+import sys
+import time
+from core.database import create_catalog_engine, employee_catalog
+from core.settings import settings
+from employees.models import Employee
+from sqlalchemy import func, select
+
+
+def measure(fn, repeats: int) -> float:
+    """Returns median duration of fn() in milliseconds"""
+    fn()  # warm up connection pool and compiled cache
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main(repeats: int = 200):
+    catalog = employee_catalog
+    with catalog.engine.connect() as conn:
+        root_id = conn.scalar(select(func.min(Employee.id)))
+    if root_id is None:
+        print("Database is empty, run gendb first")
+        return
+    scenarios = {
+        "empl (ORM)": lambda: catalog._fetch_employees_page(
+            sort_opts=[{"order_field": "salary", "descending": True}],
+            filter_opts=[{"field": "position", "value": "Developer"}],
+        ),
+        "empl (projection)": lambda: catalog._fetch_employees_page(
+            sort_opts=[{"order_field": "salary", "descending": True}],
+            filter_opts=[{"field": "position", "value": "Developer"}],
+            projection=True,
+        ),
+        "empl -f:name": lambda: catalog._fetch_employees_page(
+            filter_opts=[{"field": "name", "value": "ан"}],
+            projection=True,
+        ),
+        "tree": lambda: catalog.get_hierarchy(root_id=root_id, limit=30),
+    }
+    thresholds = {"not prepared": None, "prepared": settings.DB_PREPARE_THRESHOLD}
+    results = {}
+    original_engine = catalog.engine
+    try:
+        for mode, threshold in thresholds.items():
+            # Calls run one by one, so pool reuses one connection and its
+            # prepared statements
+            catalog.engine = create_catalog_engine(prepare_threshold=threshold)
+            for name, fn in scenarios.items():
+                results[name, mode] = measure(fn, repeats)
+            catalog.engine.dispose()
+    finally:
+        catalog.engine = original_engine
+    print(f"{'scenario':<20}{'not prepared, ms':>18}{'prepared, ms':>16}{'gain':>8}")
+    for name in scenarios:
+        plain = results[name, "not prepared"]
+        prepared = results[name, "prepared"]
+        print(f"{name:<20}{plain:>18.3f}{prepared:>16.3f}{plain / prepared:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]))
@@ -0,0 +1,64 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class QueryCache:
+    """
+    In-process LRU cache of query results with time-to-live.
+
+    :param maxsize: Maximum number of stored results, 0 disables cache
+    :param ttl: Seconds after which result is considered stale. Protects
+                against writes made by other processes, which cannot
+                invalidate this cache.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        """Returns (True, value) for fresh cached key, (False, None) otherwise"""
+        item = self._data.get(key)
+        if item is not None:
+            expires, value = item
+            if expires > time.monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return True, value
+            del self._data[key]
+        self.misses += 1
+        return False, None
+
+    def set(self, key: Hashable, value: Any):
+        if self.maxsize <= 0:
+            return
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        """Drops all cached results, counters are kept"""
+        self._data.clear()
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+        }
+
+
+def freeze(value: Any) -> Hashable:
+    """Converts nested dicts/lists of options into hashable cache key"""
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
@@ -1,8 +1,15 @@
+import re
 from typing import List
 from .localization import messages
 from core.database import employee_catalog
 from core.settings import settings
-from core.cli.views import print_employees_table, print_hierarchy
+from core.cli.views import (
+    print_employees_table,
+    print_hierarchy,
+    print_reporting_chain,
+    print_salary_stats,
+    print_span_of_control,
+)
 from datetime import date
 
 
@@ -14,6 +21,8 @@ class CommandLine:
             if callable(getattr(self, method)) and not method.startswith("_")
         ]
         self.should_exit = False
+        # Arguments and result page of last empl call, used by -p:next/-p:prev
+        self._listing = None
         self.fields = (
             "id",
             "name",
@@ -22,21 +31,49 @@ class CommandLine:
             "salary",
             "manager",
         )
+        # "under" selects all direct and indirect subordinates of employee
+        self.filter_fields = (*self.fields, "under")
 
     def gendb(self, options: List[str] | None = None):
         """Reset all data in database"""
+        arguments = {}
+        if options:
+            for opt in options:
+                if opt == "-a":
+                    arguments["reset"] = False
+                elif opt[:3] == "-e:":
+                    arguments["engine"] = opt[3:]
+                elif opt[:3] == "-c:":
+                    arguments["chunk_size"] = int(opt[3:])
+                elif opt == "-i":
+                    arguments["concurrent_indexes"] = True
+                elif opt[:3] == "-s:":
+                    arguments["seed"] = int(opt[3:])
+                elif opt == "-p":
+                    arguments["snapshot"] = True
+                else:
+                    raise ValueError(
+                        messages["errors"]["cli"]["options"].format(opt=opt)
+                    )
         print(messages["ui"]["prompts"]["gen_data"])
-        if options and len(options) == 1:
-            if options[0] == "-a":
-                employee_catalog.init_data(reset=False)
-        else:
-            employee_catalog.init_data()
+        employee_catalog.init_data(progress=self._print_progress, **arguments)
+        print()
         print(
             messages["ui"]["prompts"]["gen_data_complete"].format(
                 n=settings.INITIAL_DATA_COUNT
             )
         )
 
+    def _print_progress(self, done: int, total: int):
+        """Rewrites progress line of long running command"""
+        print(
+            messages["ui"]["prompts"]["progress"].format(
+                done=done, total=total, percent=done / total if total else 1
+            ),
+            end="\r",
+            flush=True,
+        )
+
     def help(self, options: List[str] | None = None):
         """Show avialable commands with descriptions"""
         if options and len(options) == 1:
@@ -76,6 +113,7 @@ class CommandLine:
         sort_opts = []
         filter_opts = []
         arguments = {}
+        page_to = None
         if options:
             for opt in options:
                 if "-s:" == opt[:3]:
@@ -107,28 +145,106 @@ class CommandLine:
                             messages["errors"]["cli"]["options"].format(opt=sort_opt)
                         )
                 elif "-f:" == opt[:3]:
-                    filter_opt = opt[3:].split("=")
-                    if len(filter_opt) != 2 or filter_opt[0] not in self.fields:
+                    filter_opt = re.fullmatch(r"(\w+)(>=|<=|>|<|=)(.+)", opt[3:])
+                    if not filter_opt or filter_opt[1] not in self.filter_fields:
                         raise ValueError(
-                            messages["errors"]["cli"]["options"].format(opt=filter_opt)
+                            messages["errors"]["cli"]["options"].format(opt=opt[3:])
                         )
-                    filter_opts.append({"field": filter_opt[0], "value": filter_opt[1].replace('_', ' ')})
+                    field, op, value = filter_opt.groups()
+                    value = value.replace('_', ' ')
+                    if op == "=" and ".." in value:
+                        op = "between"
+                        value = tuple(value.split("..", 1))
+                    filter_opts.append({"field": field, "op": op, "value": value})
                 elif "-l:" == opt[:3]:
                     arguments["limit"] = int(opt[3:])
+                elif "-p:" == opt[:3]:
+                    if opt[3:] not in ("next", "prev") or self._listing is None:
+                        raise ValueError(
+                            messages["errors"]["cli"]["options"].format(opt=opt)
+                        )
+                    page_to = opt[3:]
+                elif opt == "-c":
+                    arguments["exact_count"] = True
                 else:
                     raise ValueError('Incorrect option')
-        arguments["sort_opts"] = sort_opts
-        arguments["filter_opts"] = filter_opts
+        if page_to:
+            # Continue last listing from its cursor, only limit can be changed
+            if sort_opts or filter_opts or "exact_count" in arguments:
+                raise ValueError(messages["errors"]["cli"]["page_options"])
+            last_arguments, last_page = self._listing
+            # Total does not depend on page, so it is not counted again
+            arguments = {
+                **last_arguments,
+                **arguments,
+                "count": False,
+                "exact_count": False,
+            }
+            if page_to == "next":
+                cursor = {"after": last_page.next_cursor}
+            else:
+                cursor = {"before": last_page.prev_cursor}
+            if None in cursor.values():
+                print(messages["errors"]["cli"]["no_page"])
+                return
+        else:
+            arguments["sort_opts"] = sort_opts
+            arguments["filter_opts"] = filter_opts
+            arguments["projection"] = True
+            arguments["count"] = True
+            cursor = {}
         try:
-            empls = employee_catalog.get_employees_list(**arguments)
+            page = employee_catalog.get_employees_page(**arguments, **cursor)
         except Exception as e:
             print(e)
         else:
-            if empls:
-                print_employees_table(empls)
+            if page_to:
+                page = page._replace(
+                    total=last_page.total, total_exact=last_page.total_exact
+                )
+            if page.rows:
+                self._listing = (arguments, page)
+                print_employees_table(
+                    page.rows, total=page.total, total_exact=page.total_exact
+                )
             else:
                 print(messages["errors"]["cli"]["empty_table"])
 
+    def search(self, options: List[str] | None = None):
+        """Full-text search of employees"""
+        words = []
+        arguments = {}
+        for opt in options or []:
+            if opt[:3] == "-l:":
+                arguments["limit"] = int(opt[3:])
+            elif opt[:1] == "-" and len(opt) > 1 and opt[1] != "-" and ":" in opt:
+                raise ValueError(messages["errors"]["cli"]["options"].format(opt=opt))
+            else:
+                words.append(opt)
+        if not words:
+            raise ValueError(messages["errors"]["cli"]["no_query"])
+        records = employee_catalog.search(query=" ".join(words), **arguments)
+        if records:
+            print_employees_table(records)
+        else:
+            print(messages["errors"]["cli"]["empty_table"])
+
+    def stats(self, options: List[str] | None = None):
+        """Show headcount and salary statistics"""
+        arguments = {"by": "position"}
+        for opt in options or []:
+            if opt[:3] == "-g:":
+                arguments["by"] = opt[3:]
+            elif opt == "-r":
+                arguments["refresh"] = True
+            else:
+                raise ValueError(messages["errors"]["cli"]["options"].format(opt=opt))
+        stats = employee_catalog.get_salary_stats(**arguments)
+        if stats:
+            print_salary_stats(stats, by=arguments["by"])
+        else:
+            print(messages["errors"]["cli"]["empty_table"])
+
     def quit(self, options: None):
         """Exit the application"""
         print(messages["ui"]["prompts"]["exit"])
@@ -136,22 +252,61 @@ class CommandLine:
 
     def tree(self, options: List[str] | None = None):
         """Prints employees hierarchy"""
-        arguments = {}
-        if options and len(options) == 1 and options[0][:3] == '-e:':
-            arguments = {'root_id': int(options[0][3:])}
-            arguments["limit"] = 30
-        elif options and len(options) == 2 and options[0][:3] == '-e:':
-            arguments = {'root_id': int(options[0][3:])}
-            if options[1][:3] == '-l:':
-                arguments["limit"] = int(options[1][3:])
-        else:
-            raise ValueError('Incorrect options')
+        arguments = {"limit": 30}
+        max_siblings = None
+        for opt in options or []:
+            if opt[:3] == "-e:":
+                arguments["root_id"] = int(opt[3:])
+            elif opt[:3] == "-l:":
+                arguments["limit"] = int(opt[3:])
+            elif opt[:3] == "-d:":
+                arguments["max_depth"] = int(opt[3:])
+            elif opt[:3] == "-c:":
+                max_siblings = int(opt[3:])
+            elif opt == "-r":
+                arguments["rollup"] = True
+            else:
+                raise ValueError(messages["errors"]["cli"]["options"].format(opt=opt))
+        if "root_id" not in arguments:
+            raise ValueError(messages["errors"]["cli"]["values"])
         hierarchy = employee_catalog.get_hierarchy(**arguments)
         if hierarchy:
-            print_hierarchy(hierarchy)
+            print_hierarchy(hierarchy, max_siblings=max_siblings)
         else:
             print(messages["errors"]["cli"]["empty_hierarchy"])
 
+    def chain(self, options: List[str] | None = None):
+        """Prints reporting chain of employee up to CEO"""
+        employee_id = None
+        for opt in options or []:
+            if opt[:3] == "-e:":
+                employee_id = int(opt[3:])
+            else:
+                raise ValueError(messages["errors"]["cli"]["options"].format(opt=opt))
+        if employee_id is None:
+            raise ValueError(messages["errors"]["cli"]["values"])
+        chain = employee_catalog.get_reporting_chain(employee_id=employee_id)
+        if chain:
+            print_reporting_chain(chain)
+        else:
+            print(messages["errors"]["cli"]["empty_hierarchy"])
+
+    def span(self, options: List[str] | None = None):
+        """Shows span of control of managers"""
+        arguments = {}
+        for opt in options or []:
+            if opt[:3] == "-t:":
+                arguments["min_reports"] = int(opt[3:])
+            elif opt[:3] == "-l:":
+                arguments["limit"] = int(opt[3:])
+            else:
+                raise ValueError(messages["errors"]["cli"]["options"].format(opt=opt))
+        span = employee_catalog.get_span_of_control(**arguments)
+        if span:
+            print_span_of_control(span, min_reports=arguments.get("min_reports"))
+        else:
+            print(messages["errors"]["cli"]["empty_table"])
+
     def add(self, options: List[str] | None = None):
         """Create new employee"""
         arguments = {'emp_data': {}}
@@ -220,6 +375,53 @@ class CommandLine:
         except Exception as e:
             print(messages['errors']['database']['query'].format(error=e))
 
+    def imp(self, options: List[str] | None = None):
+        """Import employees from CSV or JSONL file"""
+        path, fmt = self._exchange_options(options)
+        try:
+            with open(path, "r", encoding="utf-8", newline="") as f:
+                count = employee_catalog.import_employees(file=f, fmt=fmt)
+            print(messages["success"]["employees_imported"].format(n=count))
+        except Exception as e:
+            print(messages["errors"]["database"]["query"].format(error=e))
+
+    def exp(self, options: List[str] | None = None):
+        """Export employees to CSV or JSONL file"""
+        path, fmt = self._exchange_options(options)
+        try:
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                count = employee_catalog.export_employees(file=f, fmt=fmt)
+            print(messages["success"]["employees_exported"].format(n=count, path=path))
+        except Exception as e:
+            print(messages["errors"]["database"]["query"].format(error=e))
+
+    def _exchange_options(self, options: List[str] | None) -> tuple:
+        """Parses -f:<path> [-t:<csv|jsonl>] options of imp/exp commands"""
+        path = None
+        fmt = None
+        for opt in options or []:
+            if opt[:3] == "-f:":
+                path = opt[3:]
+            elif opt[:3] == "-t:":
+                fmt = opt[3:]
+            else:
+                raise ValueError(messages["errors"]["cli"]["options"].format(opt=opt))
+        if not path:
+            raise ValueError(messages["errors"]["cli"]["options"].format(opt="-f"))
+        if fmt is None:
+            fmt = "jsonl" if path.endswith((".jsonl", ".json")) else "csv"
+        return path, fmt
+
+    def cache(self, options: List[str] | None = None):
+        """Show or clear employee listing cache"""
+        for opt in options or []:
+            if opt == "-c":
+                employee_catalog.cache.clear()
+                print(messages["success"]["cache_cleared"])
+            else:
+                raise ValueError(messages["errors"]["cli"]["options"].format(opt=opt))
+        print(messages["ui"]["prompts"]["cache_stats"].format(**employee_catalog.cache.stats()))
+
     def dlt(self, options: List[str]):
         if options[0][:3] == '-e:':
             id = int(options[0][3:])
@@ -1,10 +1,18 @@
+import sys
 from core.cli.localization import messages
-from typing import List, Dict
+from typing import Iterator, List, TextIO
 from tabulate import tabulate
 
 
-def print_employees_table(employees: List[Dict]):
-    """Prints employees list or one employee in table"""
+def print_employees_table(
+    employees: List, total: int | None = None, total_exact: bool = True
+):
+    """
+    Prints employees list or one employee in table.
+    Accepts Employee entities as well as EmployeeRecord tuples.
+    Count of all matching employees is shown if total is given,
+    marked as approximate unless total_exact.
+    """
     if not employees:
         msg = messages["errors"]["cli"]["empty_table"]
         raise ValueError(msg)
@@ -12,45 +20,181 @@ def print_employees_table(employees: List[Dict]):
     t = "title" if len(employees) > 1 else "title_one"
     title = messages["ui"]["views"]["emps_tbl"][t]
     print(title)
+    if total is not None:
+        shown = "shown" if total_exact else "shown_approx"
+        print(
+            messages["ui"]["views"]["emps_tbl"][shown].format(
+                n=len(employees), total=total
+            )
+        )
     table_data = []
     for emp in employees:
         table_data.append(
             [
                 emp.id,
                 emp.get_full_name(),
-                emp.position.title,
+                emp.position_title,
                 emp.hire_date.strftime("%Y-%m-%d"),
                 f"{emp.salary:,.2f}",
-                emp.manager.get_full_name() if emp.manager else "",
+                emp.get_manager_name(),
             ]
         )
     headers = messages["ui"]["views"]["emps_tbl"]["headers"]
     print(tabulate(table_data, headers=headers, tablefmt="grid"))
 
 
-def print_hierarchy(hierarchy: dict):
-    """Prints employee hierarchy in a formatted tree structure using recursion"""
-
-    def gen_str(hierarchy: dict, indent: str = "", sep: str = ""):
-        result = ""
-        employee = hierarchy
-        result += f"{indent}{sep}{employee['full_name']} ({employee['position']})\n"
-        subordinates = employee["subordinates"]
-        if not subordinates:
-            return result
-        if sep == "└── ":
-            indent += "    "
-        elif sep == "├── ":
-            indent += "│   "
-        for i, sb in enumerate(subordinates):
-            is_last = i == len(subordinates) - 1
-            if is_last:
-                result += gen_str(hierarchy=sb, indent=indent, sep="└── ")
-            else:
-                result += gen_str(hierarchy=sb, indent=indent, sep="├── ")
-        return result
+def print_salary_stats(stats: List, by: str):
+    """Prints salary statistics groups in table"""
+    views = messages["ui"]["views"]["stats_tbl"]
+    print(views["title"].format(group=views["groups"][by]))
+    table_data = [
+        [
+            row.key if by != "total" else "",
+            row.headcount,
+            row.total,
+            row.average,
+            row.median,
+            row.p25,
+            row.p75,
+            row.p90,
+        ]
+        for row in stats
+    ]
+    headers = [views["groups"][by], *views["headers"]]
+    print(tabulate(table_data, headers=headers, tablefmt="grid", floatfmt=",.2f"))
+
+
+def print_reporting_chain(chain: List):
+    """Prints employee and its managers up to CEO in table"""
+    views = messages["ui"]["views"]["chain_tbl"]
+    print(views["title"].format(name=chain[0].full_name))
+    table_data = [
+        [link.distance, link.id, link.full_name, link.position_title]
+        for link in chain
+    ]
+    print(tabulate(table_data, headers=views["headers"], tablefmt="grid"))
+
+
+def print_span_of_control(span, min_reports: int | None = None):
+    """Prints span of control summary, widest spans and deepest chains"""
+    views = messages["ui"]["views"]["span_tbl"]
+    print(views["title"])
+    print(
+        views["summary"].format(
+            managers=span.managers,
+            average=span.average_span,
+            depth=span.max_depth,
+        )
+    )
+    if min_reports is not None:
+        print(views["threshold"].format(n=min_reports, count=span.over_threshold))
+    if span.widest:
+        table_data = [
+            [
+                row.id,
+                row.full_name,
+                row.position_title,
+                row.depth,
+                row.direct_reports,
+                row.total_reports,
+            ]
+            for row in span.widest
+        ]
+        print(tabulate(table_data, headers=views["headers"], tablefmt="grid"))
+    print(views["deepest"])
+    table_data = [
+        [row.id, row.full_name, row.position_title, row.depth, row.path]
+        for row in span.deepest
+    ]
+    print(tabulate(table_data, headers=views["deepest_headers"], tablefmt="grid"))
+
+
+def rollup_text(rollup) -> str:
+    """Headcount and payroll annotation of tree node"""
+    return messages["ui"]["views"]["tree"]["rollup"].format(
+        headcount=rollup.headcount,
+        payroll=rollup.payroll,
+        average=rollup.average_salary,
+    )
+
+
+def node_text(node: dict) -> str:
+    """Employee line of tree without branch prefix"""
+    text = f"{node['full_name']} ({node['position']})"
+    if node.get("rollup"):
+        text += " " + rollup_text(node["rollup"])
+    return text
+
+
+def iter_hierarchy_lines(
+    hierarchy: dict,
+    max_depth: int | None = None,
+    max_siblings: int | None = None,
+) -> Iterator[str]:
+    """
+    Yields lines of employee hierarchy drawn as tree, without line breaks.
+
+    :param hierarchy: Root node, see EmployeeCatalog.get_hierarchy()
+    :param max_depth: Levels drawn below root, subordinates of the last
+                      drawn level are summarized in one line
+    :param max_siblings: Subordinates drawn per employee, the rest are
+                         summarized in one line
+
+    Walks tree with explicit stack of subordinate iterators, so depth is
+    not limited by recursion and memory holds one path from root, not the
+    output. Prefix of each level is built once from the parent's one.
+    """
+    views = messages["ui"]["views"]["tree"]
+    yield node_text(hierarchy)
+    # (subordinates, next index, prefix of their lines, their depth)
+    stack = [(hierarchy["subordinates"], 0, "", 1)]
+    while stack:
+        subordinates, index, prefix, depth = stack.pop()
+        shown = len(subordinates)
+        if max_siblings is not None:
+            shown = min(shown, max_siblings)
+        if max_depth is not None and depth > max_depth:
+            if subordinates:
+                yield prefix + "└── " + views["hidden"].format(n=len(subordinates))
+            continue
+        if index >= shown:
+            if shown < len(subordinates):
+                yield prefix + "└── " + views["more"].format(
+                    n=len(subordinates) - shown
+                )
+            continue
+        node = subordinates[index]
+        is_last = index == len(subordinates) - 1
+        yield prefix + ("└── " if is_last else "├── ") + node_text(node)
+        stack.append((subordinates, index + 1, prefix, depth))
+        if node["subordinates"]:
+            stack.append(
+                (
+                    node["subordinates"],
+                    0,
+                    prefix + ("    " if is_last else "│   "),
+                    depth + 1,
+                )
+            )
+
 
+def print_hierarchy(
+    hierarchy: dict,
+    max_depth: int | None = None,
+    max_siblings: int | None = None,
+    file: TextIO | None = None,
+):
+    """
+    Prints employee hierarchy in a formatted tree structure line by line,
+    see iter_hierarchy_lines()
+    """
+    file = file or sys.stdout
     if not hierarchy:
-        print(messages["errors"]["cli"]["empty_hierarchy"])
+        print(messages["errors"]["cli"]["empty_hierarchy"], file=file)
         return
-    print(gen_str(hierarchy=hierarchy) + " ...")
+    for line in iter_hierarchy_lines(
+        hierarchy, max_depth=max_depth, max_siblings=max_siblings
+    ):
+        file.write(line)
+        file.write("\n")
+    file.write(" ...\n")
@@ -1,22 +1,61 @@
 from core.settings import settings
+from core.cli.localization import messages
 from sqlalchemy import (
     and_,
     create_engine,
-    MetaData,
     select,
     func,
     union_all,
     select,
     alias,
+    text,
+    or_,
+    tuple_,
+    bindparam,
+    literal,
+    Integer,
+    any_,
 )
+from sqlalchemy.dialects.postgresql import ARRAY, REGCONFIG
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateIndex
 from sqlalchemy.orm import Session, joinedload, aliased
-from employees.models import Base, POSITION_HIERARCHY, Position, Employee
-from mimesis import Person, Datetime, Finance, Text
-from mimesis.locales import Locale
-from mimesis.enums import Gender
-from mimesis.builtins.ru import RussiaSpecProvider
+from employees.models import (
+    Base,
+    POSITION_HIERARCHY,
+    Position,
+    Employee,
+    format_full_name,
+    full_name_expression,
+)
+from core.generators import (
+    ColumnBatch,
+    EmployeeGenerator,
+    GENERATION_ENGINES,
+    HIRE_DATE_END,
+    HIRE_DATE_START,
+    bounded_map,
+    build_name_pools,
+    split_tasks,
+)
+from mimesis import Text
+from core.cache import QueryCache, freeze
+from core.hierarchy import build_tree
+from core.orgindex import OrgIndex
+from core.snapshots import SnapshotWriter, read_snapshot, snapshot_path
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+from contextlib import contextmanager, nullcontext
+import base64
+import csv
+import json
+from datetime import date, timedelta
+from decimal import Decimal
 import random
-from typing import List, Dict
+import re
+from typing import Callable, List, Dict, Iterable, NamedTuple, Sequence, TextIO
+import numpy as np
 
 
 DB_CONFIG = {
@@ -27,48 +66,1172 @@ DB_CONFIG = {
     "port": settings.DB_PORT,
 }
 
-lang_dict = {
-    "ru": Locale.RU,
-    "en": Locale.EN,
-}
+# Column order of rows accepted by EmployeeCatalog.copy_employees()
+EMPLOYEE_COPY_COLUMNS = (
+    "id",
+    "first_name",
+    "last_name",
+    "patronymic",
+    "position_id",
+    "hire_date",
+    "salary",
+    "manager_id",
+)
+
+# Bulk loads go through staging table and one INSERT ... SELECT, which
+# computes org_path and search_vector for all rows at once instead of row
+# triggers (see SQL_BULK_LOAD_ON). Managers may be in the same batch
+SQL_CREATE_LOAD_TABLE = text(
+    """
+    CREATE TEMPORARY TABLE employees_load (
+        id integer,
+        first_name varchar(50),
+        last_name varchar(50),
+        patronymic varchar(50),
+        position_id integer,
+        hire_date date,
+        salary numeric(10, 2),
+        manager_id integer
+    ) ON COMMIT DROP
+    """
+)
+SQL_INSERT_LOADED = text(
+    f"""
+    WITH RECURSIVE paths AS (
+        SELECT
+            s.id,
+            CASE
+                WHEN s.manager_id IS NULL THEN s.id::text::ltree
+                ELSE m.org_path || s.id::text
+            END AS org_path
+        FROM employees_load s
+        LEFT JOIN employees m ON m.id = s.manager_id
+        WHERE s.manager_id IS NULL OR m.id IS NOT NULL
+        UNION ALL
+        SELECT s.id, paths.org_path || s.id::text
+        FROM employees_load s
+        JOIN paths ON s.manager_id = paths.id
+    )
+    INSERT INTO employees ({", ".join(EMPLOYEE_COPY_COLUMNS)}, org_path, search_vector)
+    SELECT
+        {", ".join(f"s.{column}" for column in EMPLOYEE_COPY_COLUMNS)},
+        paths.org_path,
+        employee_search_vector(
+            s.last_name, s.first_name, s.patronymic, s.position_id
+        )
+    FROM employees_load s
+    LEFT JOIN paths ON paths.id = s.id
+    """
+)
+SQL_DROP_LOAD_TABLE = text("DROP TABLE employees_load")
+
+# Set-based generation of one hierarchy level into employees_load, see
+# _load_employees_sql()
+SQL_GENERATE_LEVEL = text(
+    """
+    WITH managers AS (
+        SELECT row_number() OVER (ORDER BY e.id) - 1 AS idx, e.id
+        FROM employees e
+        JOIN positions p ON p.id = e.position_id
+        WHERE p.level = :level - 1
+    ),
+    pool_sizes AS (
+        SELECT
+            gender,
+            count(*) FILTER (WHERE kind = 'first_name') AS first_names,
+            count(*) FILTER (WHERE kind = 'last_name') AS last_names,
+            count(*) FILTER (WHERE kind = 'patronymic') AS patronymics
+        FROM gen_names
+        GROUP BY gender
+    ),
+    series AS MATERIALIZED (
+        SELECT
+            n,
+            floor(random() * 2)::int AS gender,
+            random() AS first_name,
+            random() AS last_name,
+            random() AS patronymic,
+            random() AS position,
+            random() AS hire_date,
+            random() AS salary,
+            random() AS manager
+        FROM generate_series(0, :count - 1) AS n
+    )
+    INSERT INTO employees_load (
+        id, first_name, last_name, patronymic, position_id, hire_date, salary,
+        manager_id
+    )
+    SELECT
+        :first_id + s.n,
+        fn.name,
+        ln.name,
+        pn.name,
+        (CAST(:position_ids AS integer[]))[
+            1 + floor(s.position * cardinality(CAST(:position_ids AS integer[])))::int
+        ],
+        CAST(:date_start AS date) + floor(s.hire_date * :date_span)::int,
+        round((30000 + s.salary * 270000)::numeric, 2),
+        m.id
+    FROM series s
+    JOIN pool_sizes z ON z.gender = s.gender
+    JOIN gen_names fn
+        ON (fn.kind, fn.gender, fn.idx)
+        = ('first_name', s.gender, floor(s.first_name * z.first_names)::int)
+    JOIN gen_names ln
+        ON (ln.kind, ln.gender, ln.idx)
+        = ('last_name', s.gender, floor(s.last_name * z.last_names)::int)
+    LEFT JOIN gen_names pn
+        ON (pn.kind, pn.gender, pn.idx)
+        = ('patronymic', s.gender, floor(s.patronymic * z.patronymics)::int)
+    LEFT JOIN managers m
+        ON m.idx = floor(s.manager * (SELECT count(*) FROM managers))::int
+    """
+)
+
+# Values of date filter: YYYY, YYYY-MM or YYYY-MM-DD, see _date_range()
+DATE_PREFIX = re.compile(r"\d{4}(-\d{1,2}(-\d{1,2})?)?")
+
+# Columns of files handled by import_employees() / export_employees()
+EXCHANGE_COLUMNS = (
+    "id",
+    "last_name",
+    "first_name",
+    "patronymic",
+    "position",
+    "hire_date",
+    "salary",
+    "manager_id",
+)
+EXCHANGE_FORMATS = ("csv", "jsonl")
+
+# record_no numbers data records in file order: header and blank lines are
+# not counted, so errors refer to records, not to lines of the file
+SQL_CREATE_IMPORT_TABLE = text(
+    """
+    CREATE TEMPORARY TABLE employees_import (
+        record_no bigserial,
+        id integer,
+        last_name varchar(50),
+        first_name varchar(50),
+        patronymic varchar(50),
+        position varchar(100),
+        hire_date text,
+        salary text,
+        manager_id integer
+    ) ON COMMIT DROP
+    """
+)
+
+# hire_date and salary are staged as text and checked by SQL_VALIDATE_IMPORT,
+# so bad values are reported by record instead of failing COPY. Returns
+# error key of messages["errors"]["import"] or NULL
+SQL_IMPORT_SETUP = text(
+    r"""
+    CREATE OR REPLACE FUNCTION employee_import_value_error(
+        hire_date text, salary text
+    )
+    RETURNS text LANGUAGE plpgsql STABLE AS $$
+    DECLARE
+        parsed_date date;
+        parsed_salary numeric(10, 2);
+    BEGIN
+        IF hire_date IS NULL OR hire_date !~ '^\s*\d{4}-\d{2}-\d{2}\s*$' THEN
+            RETURN 'hire_date';
+        END IF;
+        BEGIN
+            parsed_date := hire_date::date;
+        EXCEPTION WHEN data_exception THEN
+            RETURN 'hire_date';
+        END;
+        IF parsed_date > current_date THEN
+            RETURN 'hire_date';
+        END IF;
+        BEGIN
+            parsed_salary := salary::numeric(10, 2);
+        EXCEPTION WHEN data_exception THEN
+            RETURN 'salary';
+        END;
+        IF parsed_salary IS NULL OR parsed_salary <= 0 THEN
+            RETURN 'salary';
+        END IF;
+        RETURN NULL;
+    END
+    $$
+    """
+)
+
+SQL_FILL_IMPORT_IDS = text(
+    """
+    UPDATE employees_import
+    SET id = nextval(pg_get_serial_sequence('employees', 'id'))
+    WHERE id IS NULL
+    """
+)
+
+# Returns first invalid rows of staging table with error keys of
+# messages["errors"]["import"]
+SQL_VALIDATE_IMPORT = text(
+    """
+    WITH known AS (
+        SELECT i.id, p.level
+        FROM employees_import i
+        JOIN positions p ON p.title = i.position
+        UNION ALL
+        SELECT e.id, p.level
+        FROM employees e
+        JOIN positions p ON p.id = e.position_id
+    ),
+    checked AS (
+        SELECT
+            s.record_no,
+            s.id,
+            s.position,
+            s.manager_id,
+            coalesce(s.hire_date, '') AS hire_date,
+            coalesce(s.salary, '') AS salary,
+            CASE
+                WHEN s.last_name IS NULL OR s.first_name IS NULL THEN 'name'
+                WHEN v.error IS NOT NULL THEN v.error
+                WHEN p.id IS NULL THEN 'position'
+                WHEN count(*) OVER (PARTITION BY s.id) > 1
+                    OR EXISTS (SELECT 1 FROM employees e WHERE e.id = s.id)
+                    THEN 'duplicate_id'
+                WHEN p.level = 1 AND s.manager_id IS NOT NULL THEN 'ceo_manager'
+                WHEN p.level > 1 AND s.manager_id IS NULL THEN 'no_manager'
+                WHEN p.level > 1 AND m.level IS NULL THEN 'manager_id'
+                WHEN m.level >= p.level THEN 'manager_level'
+            END AS error
+        FROM employees_import s
+        CROSS JOIN LATERAL (
+            SELECT employee_import_value_error(s.hire_date, s.salary) AS error
+        ) v
+        LEFT JOIN positions p ON p.title = s.position
+        LEFT JOIN known m ON m.id = s.manager_id
+    )
+    SELECT * FROM checked
+    WHERE error IS NOT NULL
+    ORDER BY record_no
+    LIMIT 10
+    """
+)
+
+SQL_INSERT_IMPORT = text(
+    """
+    INSERT INTO employees (
+        id, first_name, last_name, patronymic, position_id, hire_date, salary, manager_id
+    )
+    SELECT
+        s.id, s.first_name, s.last_name, s.patronymic, p.id,
+        s.hire_date::date, s.salary::numeric(10, 2), s.manager_id
+    FROM employees_import s
+    JOIN positions p ON p.title = s.position
+    ORDER BY p.level, s.record_no
+    """
+)
+
+# Hot statements and aliases are built once at import. Values are passed as
+# bound parameters, so SQLAlchemy compiles every statement once and psycopg
+# can prepare it on the server (see DB_PREPARE_THRESHOLD)
+ListPosition = aliased(Position, name="list_position")
+ListManager = aliased(Employee, name="list_manager")
+ManagerSearch = aliased(Employee, name="manager_search")
+
+STMT_POSITION_IDS = select(Position.id)
+STMT_POSITION_BY_TITLE = select(Position.id).where(
+    Position.title == bindparam("title")
+)
+STMT_POSITION_LEVEL = select(Position.level).where(
+    Position.id == bindparam("position_id")
+)
+STMT_EMPLOYEE_IDS_BY_LEVEL = (
+    select(Employee.id).join(Position).where(Position.level == bindparam("level"))
+)
+
+
+def _hierarchy_statement():
+    """
+    Employee bindparam("root_id") and its subordinates, at most
+    bindparam("limit") rows and bindparam("max_depth") levels below root
+    (NULL - unbounded), in breadth-first order: by depth, then by ID.
+
+    Subtree is one org_path <@ lookup, no recursion. Planner either walks
+    idx_emp_org_depth in (depth, id) order until limit rows match, which
+    suits large subtrees, or collects small subtree by GiST index
+    idx_emp_org_path and sorts it.
+    """
+    emp = aliased(Employee, name="emp")
+    root = aliased(Employee, name="root")
+    pos = aliased(Position, name="pos")
+    max_depth = bindparam("max_depth", type_=Integer)
+    depth = func.nlevel(emp.org_path)
+
+    return (
+        select(
+            emp.id,
+            emp.manager_id,
+            emp.first_name,
+            emp.last_name,
+            emp.patronymic,
+            pos.title.label("position_title"),
+            (depth - func.nlevel(root.org_path)).label("depth"),
+        )
+        .join(root, emp.org_path.bool_op("<@")(root.org_path))
+        .join(pos, emp.position_id == pos.id)
+        .where(
+            root.id == bindparam("root_id"),
+            or_(max_depth.is_(None), depth <= func.nlevel(root.org_path) + max_depth),
+        )
+        .order_by(depth, emp.id)
+        .limit(bindparam("limit"))
+    )
+
+
+STMT_HIERARCHY = _hierarchy_statement()
+
+# Version of triggers, functions and views created by init_tables(). They
+# are (re)created only when stored version differs, so a regular start
+# takes no locks on employees. Increase on every change of SQL_*_SETUP
+SCHEMA_VERSION = 4
+SQL_SCHEMA_STATE_SETUP = text(
+    """
+    CREATE TABLE IF NOT EXISTS employee_catalog_schema (
+        id int PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+        version int NOT NULL
+    )
+    """
+)
+SQL_SCHEMA_VERSION_GET = text("SELECT version FROM employee_catalog_schema")
+SQL_SCHEMA_VERSION_SET = text(
+    """
+    INSERT INTO employee_catalog_schema (version) VALUES (:version)
+    ON CONFLICT (id) DO UPDATE SET version = EXCLUDED.version
+    """
+)
+# Serializes concurrent upgrades, readers of employees are not blocked
+SQL_SCHEMA_LOCK = text("LOCK TABLE employee_catalog_schema IN EXCLUSIVE MODE")
+
+# Row triggers of employees are skipped while bulk load flag is set in
+# transaction: rows of COPY and generated levels get org_path and
+# search_vector computed set-based (see SQL_INSERT_LOADED)
+SQL_BULK_LOAD_SETUP = text(
+    """
+    CREATE OR REPLACE FUNCTION employees_bulk_load()
+    RETURNS boolean LANGUAGE sql STABLE AS $$
+        SELECT coalesce(
+            current_setting('employee_catalog.bulk_load', true), ''
+        ) = 'on'
+    $$
+    """
+)
+SQL_BULK_LOAD_ON = text("SELECT set_config('employee_catalog.bulk_load', 'on', true)")
+SQL_BULK_LOAD_OFF = text(
+    "SELECT set_config('employee_catalog.bulk_load', 'off', true)"
+)
+
+# Org chart as ltree paths of IDs, e.g. "1.5.42", maintained by triggers:
+# path is derived from manager's path on insert and on manager change, and
+# the whole subtree is re-rooted when an employee moves
+SQL_ORG_PATH_SETUP = [
+    text("ALTER TABLE employees ADD COLUMN IF NOT EXISTS org_path ltree"),
+    text(
+        """
+        CREATE OR REPLACE FUNCTION employees_org_path_trigger()
+        RETURNS trigger LANGUAGE plpgsql AS $$
+        DECLARE
+            manager_path ltree;
+        BEGIN
+            -- Writing back the same manager keeps the path
+            IF TG_OP = 'UPDATE'
+                AND NEW.manager_id IS NOT DISTINCT FROM OLD.manager_id THEN
+                RETURN NEW;
+            END IF;
+            IF NEW.manager_id IS NULL THEN
+                NEW.org_path := NEW.id::text::ltree;
+                RETURN NEW;
+            END IF;
+            SELECT org_path INTO manager_path
+            FROM employees WHERE id = NEW.manager_id;
+            IF TG_OP = 'UPDATE' AND manager_path <@ OLD.org_path THEN
+                RAISE EXCEPTION 'Employee % cannot report to own subordinate %',
+                    NEW.id, NEW.manager_id;
+            END IF;
+            NEW.org_path := manager_path || NEW.id::text;
+            RETURN NEW;
+        END
+        $$
+        """
+    ),
+    text("DROP TRIGGER IF EXISTS employees_org_path ON employees"),
+    text(
+        """
+        CREATE TRIGGER employees_org_path
+        BEFORE INSERT OR UPDATE OF manager_id ON employees
+        FOR EACH ROW WHEN (NOT employees_bulk_load())
+        EXECUTE FUNCTION employees_org_path_trigger()
+        """
+    ),
+    text(
+        """
+        CREATE OR REPLACE FUNCTION employees_org_path_move()
+        RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE employees
+            SET org_path = NEW.org_path || subpath(org_path, nlevel(OLD.org_path))
+            WHERE org_path <@ OLD.org_path AND id <> NEW.id;
+            RETURN NULL;
+        END
+        $$
+        """
+    ),
+    text("DROP TRIGGER IF EXISTS employees_org_path_move ON employees"),
+    text(
+        """
+        CREATE TRIGGER employees_org_path_move
+        AFTER UPDATE OF manager_id ON employees
+        FOR EACH ROW WHEN (OLD.org_path IS DISTINCT FROM NEW.org_path)
+        EXECUTE FUNCTION employees_org_path_move()
+        """
+    ),
+]
+# Paths of rows loaded before org_path column existed, run on upgrade
+SQL_ORG_PATH_IS_MISSING = text(
+    """
+    SELECT NOT attnotnull FROM pg_attribute
+    WHERE attrelid = 'employees'::regclass AND attname = 'org_path'
+    """
+)
+SQL_ORG_PATH_BACKFILL = [
+    text(
+        """
+        WITH RECURSIVE tree AS (
+            SELECT id, id::text::ltree AS path
+            FROM employees WHERE manager_id IS NULL
+            UNION ALL
+            SELECT e.id, tree.path || e.id::text
+            FROM employees e JOIN tree ON e.manager_id = tree.id
+        )
+        UPDATE employees SET org_path = tree.path
+        FROM tree WHERE employees.id = tree.id
+        """
+    ),
+    text("ALTER TABLE employees ALTER COLUMN org_path SET NOT NULL"),
+]
+STMT_SUBTREE_SIZE = select(func.count()).where(
+    Employee.org_path.bool_op("<@")(
+        select(ManagerSearch.org_path)
+        .where(ManagerSearch.id == bindparam("root_id"))
+        .scalar_subquery()
+    )
+)
+
+# Rows of in-memory org index, see EmployeeCatalog.org_index
+STMT_ORG_INDEX_ROWS = select(Employee.id, Employee.manager_id, Position.level).join(
+    Position, Employee.position_id == Position.id
+)
+# Names and position titles of employees taken from org index
+STMT_EMPLOYEE_LABELS = (
+    select(
+        Employee.id,
+        Employee.first_name,
+        Employee.last_name,
+        Employee.patronymic,
+        Position.title.label("position_title"),
+    )
+    .join(Position, Employee.position_id == Position.id)
+    .where(Employee.id == any_(bindparam("ids", type_=ARRAY(Integer))))
+)
+
+# Planner estimate of employees count, -1 if table was never analyzed
+STMT_EMPLOYEES_RELTUPLES = select(text("reltuples::bigint")).select_from(
+    text("pg_class")
+).where(text("oid = 'employees'::regclass"))
+
+# Columns of EmployeeRecord, see select_employee_records()
+EMPLOYEE_RECORD_COLUMNS = (
+    Employee.id,
+    Employee.last_name,
+    Employee.first_name,
+    Employee.patronymic,
+    ListPosition.title,
+    Employee.hire_date,
+    Employee.salary,
+    ListManager.last_name,
+    ListManager.first_name,
+    ListManager.patronymic,
+)
+
+
+def select_employee_records(*extra_columns):
+    """
+    Core select of EMPLOYEE_RECORD_COLUMNS followed by extra_columns,
+    joined with ListPosition and ListManager
+    """
+    return (
+        select(*EMPLOYEE_RECORD_COLUMNS, *extra_columns)
+        .join(ListPosition, Employee.position_id == ListPosition.id)
+        .outerjoin(ListManager, Employee.manager_id == ListManager.id)
+    )
+
+
+# Text search configuration of settings.LANGUAGE
+SEARCH_CONFIGS = {"ru": "russian", "en": "english"}
+SEARCH_CONFIG = SEARCH_CONFIGS.get(settings.LANGUAGE, "simple")
+
+# Full-text search column and triggers maintaining it.
+# Names weigh more than position title (A vs B) in ranking
+SQL_SEARCH_SETUP = [
+    text("ALTER TABLE employees ADD COLUMN IF NOT EXISTS search_vector tsvector"),
+    text(
+        f"""
+        CREATE OR REPLACE FUNCTION employee_search_vector(
+            last_name text, first_name text, patronymic text, position_id int
+        ) RETURNS tsvector LANGUAGE sql STABLE AS $$
+            SELECT setweight(
+                to_tsvector('{SEARCH_CONFIG}', concat_ws(' ', $1, $2, $3)), 'A'
+            ) || setweight(
+                to_tsvector(
+                    '{SEARCH_CONFIG}',
+                    coalesce((SELECT title FROM positions WHERE id = $4), '')
+                ),
+                'B'
+            )
+        $$
+        """
+    ),
+    text(
+        """
+        CREATE OR REPLACE FUNCTION employees_search_vector_trigger()
+        RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.search_vector := employee_search_vector(
+                NEW.last_name, NEW.first_name, NEW.patronymic, NEW.position_id
+            );
+            RETURN NEW;
+        END
+        $$
+        """
+    ),
+    text("DROP TRIGGER IF EXISTS employees_search_vector ON employees"),
+    text(
+        """
+        CREATE TRIGGER employees_search_vector
+        BEFORE INSERT OR UPDATE OF last_name, first_name, patronymic, position_id
+        ON employees
+        FOR EACH ROW WHEN (NOT employees_bulk_load())
+        EXECUTE FUNCTION employees_search_vector_trigger()
+        """
+    ),
+    text(
+        """
+        CREATE OR REPLACE FUNCTION positions_search_vector_trigger()
+        RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE employees
+            SET search_vector = employee_search_vector(
+                last_name, first_name, patronymic, position_id
+            )
+            WHERE position_id = NEW.id;
+            RETURN NULL;
+        END
+        $$
+        """
+    ),
+    text("DROP TRIGGER IF EXISTS positions_search_vector ON positions"),
+    text(
+        """
+        CREATE TRIGGER positions_search_vector
+        AFTER UPDATE OF title ON positions
+        FOR EACH ROW WHEN (OLD.title IS DISTINCT FROM NEW.title)
+        EXECUTE FUNCTION positions_search_vector_trigger()
+        """
+    ),
+]
+
+# Configuration the stored vectors were built with, kept as column comment
+SQL_SEARCH_CONFIG_GET = text(
+    """
+    SELECT col_description(attrelid, attnum) FROM pg_attribute
+    WHERE attrelid = 'employees'::regclass AND attname = 'search_vector'
+    """
+)
+SQL_SEARCH_CONFIG_SET = text(
+    f"COMMENT ON COLUMN employees.search_vector IS '{SEARCH_CONFIG}'"
+)
+SQL_SEARCH_BACKFILL = """
+    UPDATE employees SET search_vector = employee_search_vector(
+        last_name, first_name, patronymic, position_id
+    )
+"""
+
+SEARCH_QUERY = func.websearch_to_tsquery(
+    literal(SEARCH_CONFIG, REGCONFIG), bindparam("query")
+)
+SEARCH_RANK = func.ts_rank(Employee.search_vector, SEARCH_QUERY)
+STMT_SEARCH = (
+    select_employee_records()
+    .where(Employee.search_vector.bool_op("@@")(SEARCH_QUERY))
+    .order_by(SEARCH_RANK.desc(), Employee.id)
+    .limit(bindparam("limit"))
+)
+
+# Salary statistics materialized view, see get_salary_stats(). One scan of
+# employees yields all groupings; GROUPING() bits of (level, title,
+# hire_year) tell them apart. Unique (dimension, key) index allows
+# REFRESH CONCURRENTLY. Statement triggers mark view stale after writes.
+# View is rebuilt on every schema upgrade, so its definition follows
+# SCHEMA_VERSION like functions and triggers do
+STATS_DIMENSIONS = ("position", "level", "year", "total")
+SQL_STATS_SETUP = [
+    text("DROP MATERIALIZED VIEW IF EXISTS employee_salary_stats"),
+    text(
+        """
+        CREATE MATERIALIZED VIEW employee_salary_stats AS
+        SELECT
+            dimension,
+            coalesce(title, level::text, hire_year::text, 'total') AS key,
+            level,
+            title,
+            hire_year,
+            headcount,
+            total,
+            average,
+            q[1]::numeric(12, 2) AS p25,
+            q[2]::numeric(12, 2) AS median,
+            q[3]::numeric(12, 2) AS p75,
+            q[4]::numeric(12, 2) AS p90
+        FROM (
+            SELECT
+                CASE GROUPING(level, title, hire_year)
+                    WHEN 1 THEN 'position'
+                    WHEN 3 THEN 'level'
+                    WHEN 6 THEN 'year'
+                    ELSE 'total'
+                END AS dimension,
+                level,
+                title,
+                hire_year,
+                count(*) AS headcount,
+                sum(salary) AS total,
+                round(avg(salary), 2) AS average,
+                percentile_cont(ARRAY[0.25, 0.5, 0.75, 0.9])
+                    WITHIN GROUP (ORDER BY salary) AS q
+            FROM (
+                SELECT
+                    e.salary,
+                    extract(year FROM e.hire_date)::int AS hire_year,
+                    p.level,
+                    p.title
+                FROM employees e
+                JOIN positions p ON p.id = e.position_id
+            ) s
+            GROUP BY GROUPING SETS ((level, title), (level), (hire_year), ())
+        ) g
+        """
+    ),
+    text(
+        """
+        CREATE UNIQUE INDEX idx_salary_stats_key
+        ON employee_salary_stats (dimension, key)
+        """
+    ),
+    text(
+        """
+        CREATE TABLE IF NOT EXISTS employee_salary_stats_state (
+            id int PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+            stale boolean NOT NULL DEFAULT false
+        )
+        """
+    ),
+    text(
+        "INSERT INTO employee_salary_stats_state DEFAULT VALUES "
+        "ON CONFLICT DO NOTHING"
+    ),
+    # View was just built from current data
+    text("UPDATE employee_salary_stats_state SET stale = false"),
+    text(
+        """
+        CREATE OR REPLACE FUNCTION employee_salary_stats_invalidate()
+        RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE employee_salary_stats_state SET stale = true WHERE NOT stale;
+            RETURN NULL;
+        END
+        $$
+        """
+    ),
+    text("DROP TRIGGER IF EXISTS employees_salary_stats ON employees"),
+    text(
+        """
+        CREATE TRIGGER employees_salary_stats
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON employees
+        FOR EACH STATEMENT EXECUTE FUNCTION employee_salary_stats_invalidate()
+        """
+    ),
+    text("DROP TRIGGER IF EXISTS positions_salary_stats ON positions"),
+    text(
+        """
+        CREATE TRIGGER positions_salary_stats
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON positions
+        FOR EACH STATEMENT EXECUTE FUNCTION employee_salary_stats_invalidate()
+        """
+    ),
+]
+SQL_STATS_IS_STALE = text("SELECT stale FROM employee_salary_stats_state")
+SQL_STATS_REFRESH = [
+    text("UPDATE employee_salary_stats_state SET stale = false"),
+    text("REFRESH MATERIALIZED VIEW CONCURRENTLY employee_salary_stats"),
+]
+STMT_SALARY_STATS = text(
+    """
+    SELECT key, headcount, total, average, median, p25, p75, p90
+    FROM employee_salary_stats
+    WHERE dimension = :dimension
+    ORDER BY level, hire_year, title
+    """
+)
+
+# Reporting chain of employee :employee_id, the employee first and CEO last.
+# IDs of all managers are labels of org_path, so the chain is read by
+# primary key in one query, without recursion over manager_id
+STMT_REPORTING_CHAIN = text(
+    """
+    SELECT
+        e.id,
+        e.last_name,
+        e.first_name,
+        e.patronymic,
+        p.title AS position_title,
+        nlevel(target.org_path) - chain.n AS distance
+    FROM employees target
+    CROSS JOIN LATERAL unnest(
+        string_to_array(ltree2text(target.org_path), '.')::int[]
+    ) WITH ORDINALITY AS chain(id, n)
+    JOIN employees e ON e.id = chain.id
+    JOIN positions p ON p.id = e.position_id
+    WHERE target.id = :employee_id
+    ORDER BY chain.n DESC
+    """
+)
+
+# Direct and total reports of every manager in one scan of employees: each
+# employee is counted once for every manager in its org_path, the last of
+# them being the direct one. Window totals summarize all managers, rows are
+# the :limit widest spans
+STMT_SPAN_OF_CONTROL = text(
+    """
+    WITH reports AS (
+        SELECT
+            chain.id AS manager_id,
+            count(*) FILTER (
+                WHERE chain.n = nlevel(e.org_path) - 1
+            ) AS direct_reports,
+            count(*) AS total_reports
+        FROM employees e
+        CROSS JOIN LATERAL unnest(
+            string_to_array(ltree2text(e.org_path), '.')::int[]
+        ) WITH ORDINALITY AS chain(id, n)
+        WHERE chain.n < nlevel(e.org_path)
+        GROUP BY chain.id
+    ), summary AS (
+        SELECT
+            reports.*,
+            count(*) OVER () AS managers,
+            count(*) FILTER (
+                WHERE direct_reports >= :min_reports
+            ) OVER () AS over_threshold,
+            round(avg(direct_reports) OVER (), 2) AS average_span
+        FROM reports
+    )
+    SELECT
+        m.id,
+        m.last_name,
+        m.first_name,
+        m.patronymic,
+        p.title AS position_title,
+        nlevel(m.org_path) - 1 AS depth,
+        s.direct_reports,
+        s.total_reports,
+        s.managers,
+        s.over_threshold,
+        s.average_span
+    FROM summary s
+    JOIN employees m ON m.id = s.manager_id
+    JOIN positions p ON p.id = m.position_id
+    ORDER BY s.direct_reports DESC, s.total_reports DESC, m.id
+    LIMIT :limit
+    """
+)
+
+# Employees with the longest reporting chains, backward scan of
+# idx_emp_org_depth
+STMT_DEEPEST_CHAINS = text(
+    """
+    SELECT
+        e.id,
+        e.last_name,
+        e.first_name,
+        e.patronymic,
+        p.title AS position_title,
+        nlevel(e.org_path) - 1 AS depth,
+        ltree2text(e.org_path) AS path
+    FROM employees e
+    JOIN positions p ON p.id = e.position_id
+    ORDER BY nlevel(e.org_path) DESC, e.id DESC
+    LIMIT :limit
+    """
+)
+
+# Headcount and payroll of employee and everyone under it, for all
+# employees in one scan: each employee adds its salary to itself and to
+# every manager in its org_path, so no per-manager subtree walks
+SQL_ROLLUPS = """
+    SELECT
+        team.id,
+        count(*) AS headcount,
+        sum(e.salary) AS payroll,
+        round(avg(e.salary), 2) AS average_salary
+    FROM employees e
+    CROSS JOIN LATERAL unnest(
+        string_to_array(ltree2text(e.org_path), '.')::int[]
+    ) AS team(id)
+    {where}
+    GROUP BY team.id
+"""
+STMT_ROLLUPS = text(SQL_ROLLUPS.format(where=""))
+# The same limited to subtree of :root_id (GiST lookup) and to :ids
+STMT_SUBTREE_ROLLUPS = text(
+    SQL_ROLLUPS.format(
+        where="""
+        WHERE e.org_path <@ (
+            SELECT org_path FROM employees WHERE id = :root_id
+        )
+        AND team.id = ANY(:ids)
+        """
+    )
+).bindparams(bindparam("ids", type_=ARRAY(Integer)))
+
+
+def create_catalog_engine(
+    prepare_threshold: int | None = settings.DB_PREPARE_THRESHOLD,
+):
+    """
+    Creates engine of configured database.
+
+    :param prepare_threshold: Executions of the same query on a connection
+                              after which psycopg prepares it server-side.
+                              0 prepares every query, None disables.
+    """
+    return create_engine(
+        settings.DATABASE_URL,
+        connect_args={"prepare_threshold": prepare_threshold},
+    )
+
+
+class EmployeeRecord(NamedTuple):
+    """
+    Displayed columns of employee selected without ORM entities,
+    see get_employees_page(projection=True).
+
+    Provides the same get_full_name(), position_title and
+    get_manager_name() as Employee, so views accept both.
+    """
+
+    id: int
+    last_name: str
+    first_name: str
+    patronymic: str | None
+    position_title: str
+    hire_date: date
+    salary: Decimal
+    manager_last_name: str | None
+    manager_first_name: str | None
+    manager_patronymic: str | None
+
+    def get_full_name(self) -> str:
+        return format_full_name(self.last_name, self.first_name, self.patronymic)
+
+    def get_manager_name(self) -> str:
+        if self.manager_last_name is None:
+            return ""
+        return format_full_name(
+            self.manager_last_name, self.manager_first_name, self.manager_patronymic
+        )
+
+
+class SalaryStats(NamedTuple):
+    """Headcount and salary distribution of one group of employees"""
+
+    key: str
+    headcount: int
+    total: Decimal
+    average: Decimal
+    median: Decimal
+    p25: Decimal
+    p75: Decimal
+    p90: Decimal
+
+
+class ChainLink(NamedTuple):
+    """
+    Employee in reporting chain, distance is number of levels above the
+    employee the chain was built for (0 - the employee itself)
+    """
+
+    id: int
+    full_name: str
+    position_title: str
+    distance: int
+
+
+class ManagerSpan(NamedTuple):
+    """Direct and all (direct and indirect) reports of manager"""
+
+    id: int
+    full_name: str
+    position_title: str
+    depth: int
+    direct_reports: int
+    total_reports: int
+
+
+class DeepChain(NamedTuple):
+    """Employee far from CEO, path lists IDs of chain from CEO, e.g. 1.5.42"""
+
+    id: int
+    full_name: str
+    position_title: str
+    depth: int
+    path: str
+
+
+class SpanOfControl(NamedTuple):
+    """
+    Span of control of all managers: totals, managers with the most direct
+    reports and employees with the longest reporting chains
+    """
+
+    managers: int
+    over_threshold: int
+    average_span: Decimal
+    max_depth: int
+    widest: List[ManagerSpan]
+    deepest: List[DeepChain]
+
+
+class SubtreeRollup(NamedTuple):
+    """Headcount and payroll of employee together with all its subordinates"""
+
+    headcount: int
+    payroll: Decimal
+    average_salary: Decimal
+
+
+class EmployeePage(NamedTuple):
+    """
+    Page of employees list with cursors of neighbour pages and, if
+    requested, count of all matching employees (see count_employees())
+    """
+
+    rows: List[Employee] | List[EmployeeRecord]
+    next_cursor: str | None
+    prev_cursor: str | None
+    total: int | None = None
+    total_exact: bool = False
 
 
 class EmployeeCatalog:
     """Class for managing employees database"""
 
     def __init__(self):
-        self.engine = create_engine(settings.DATABASE_URL)
-        self.person = Person(lang_dict[settings.LANGUAGE])
-        self.datetime = Datetime()
-        self.finance = Finance()
+        self.engine = create_catalog_engine()
+        self.generator = EmployeeGenerator()
+        self.person = self.generator.person
+        self.datetime = self.generator.datetime
+        self.finance = self.generator.finance
         self.text = Text()
         self.base = Base
-        self.metadata = MetaData()
+        self.cache = QueryCache(
+            maxsize=settings.LIST_CACHE_SIZE, ttl=settings.LIST_CACHE_TTL
+        )
+        self._org_index = None
         self.init_tables()
 
+    @property
+    def org_index(self) -> OrgIndex | None:
+        """
+        In-memory org chart structure, None unless ORG_INDEX setting is on.
+
+        Loaded with one query on first access and patched by
+        create_employee(), update_employee() and delete_employee().
+        Changes made by other processes are not seen until the index is
+        dropped (gendb, imp) and loaded again.
+        """
+        if not settings.ORG_INDEX:
+            return None
+        if self._org_index is None:
+            with self.engine.connect() as conn:
+                self._org_index = OrgIndex.from_rows(
+                    conn.execute(STMT_ORG_INDEX_ROWS)
+                )
+        return self._org_index
+
     def init_tables(self):
-        """Definition of tables"""
+        """
+        Definition of tables, required extensions, triggers and missing indexes.
+
+        Triggers, functions and statistics view are created by
+        _upgrade_schema() only if stored SCHEMA_VERSION or search LANGUAGE
+        differ, so a regular start only reads the version and takes no
+        locks on employees.
+        """
+        with self.engine.begin() as conn:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS ltree"))
         self.base.metadata.create_all(self.engine)
+        with self.engine.begin() as conn:
+            conn.execute(SQL_SCHEMA_STATE_SETUP)
+            current = self._schema_is_current(conn)
+        if not current:
+            self._upgrade_schema()
+        self.create_secondary_indexes()
+
+    def _schema_is_current(self, conn: Connection) -> bool:
+        return (
+            conn.scalar(SQL_SCHEMA_VERSION_GET) == SCHEMA_VERSION
+            and conn.scalar(SQL_SEARCH_CONFIG_GET) == SEARCH_CONFIG
+        )
+
+    def _upgrade_schema(self):
+        """
+        Creates or replaces triggers, functions and statistics view in one
+        transaction, then stores SCHEMA_VERSION. Statistics view is dropped
+        and built again, as there is no CREATE OR REPLACE for it.
+
+        Adds search_vector and org_path columns if missing and fills them
+        once: paths of rows loaded before org_path existed, vectors which
+        are empty or were built for other LANGUAGE.
+        """
+        with self.engine.begin() as conn:
+            conn.execute(SQL_SCHEMA_LOCK)
+            # Another process may have upgraded while we waited for lock
+            if self._schema_is_current(conn):
+                return
+            conn.execute(SQL_BULK_LOAD_SETUP)
+            conn.execute(SQL_IMPORT_SETUP)
+            for statement in SQL_ORG_PATH_SETUP:
+                conn.execute(statement)
+            if conn.scalar(SQL_ORG_PATH_IS_MISSING):
+                for statement in SQL_ORG_PATH_BACKFILL:
+                    conn.execute(statement)
+            search_config = conn.scalar(SQL_SEARCH_CONFIG_GET)
+            for statement in SQL_SEARCH_SETUP:
+                conn.execute(statement)
+            if search_config == SEARCH_CONFIG:
+                conn.execute(text(SQL_SEARCH_BACKFILL + " WHERE search_vector IS NULL"))
+            else:
+                conn.execute(text(SQL_SEARCH_BACKFILL))
+                conn.execute(SQL_SEARCH_CONFIG_SET)
+            for statement in SQL_STATS_SETUP:
+                conn.execute(statement)
+            conn.execute(SQL_SCHEMA_VERSION_SET, {"version": SCHEMA_VERSION})
 
     def truncate_all_tables(self):
-        """Deletes all data in all tables"""
-        self.metadata.reflect(bind=self.engine)
+        """Deletes all data in all tables and restarts their ID sequences"""
+        tables = ", ".join(
+            table.name for table in reversed(self.base.metadata.sorted_tables)
+        )
+        with self.engine.begin() as conn:
+            conn.execute(text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
+
+    def drop_secondary_indexes(self):
+        """Drops all indexes of employees table except primary key"""
         with self.engine.begin() as conn:
-            for table in reversed(self.metadata.sorted_tables):
-                conn.execute(table.delete())
+            for index in Employee.__table__.indexes:
+                index.drop(conn, checkfirst=True)
 
-    def init_data(self, rows: int = settings.INITIAL_DATA_COUNT, reset: bool = True):
+    def create_secondary_indexes(self, concurrently: bool = False):
+        """
+        Builds missing indexes of employees table.
+
+        :param concurrently: Build with CREATE INDEX CONCURRENTLY, which does
+                             not block writes but is slower
+        :type concurrently: bool
+        """
+        if not concurrently:
+            with self.engine.begin() as conn:
+                for index in Employee.__table__.indexes:
+                    index.create(conn, checkfirst=True)
+            return
+        # CONCURRENTLY is not allowed inside transaction block
+        with self.engine.connect().execution_options(
+            isolation_level="AUTOCOMMIT"
+        ) as conn:
+            for index in Employee.__table__.indexes:
+                # DDL is rewritten instead of setting postgresql_concurrently,
+                # which would change the shared model metadata
+                ddl = str(CreateIndex(index, if_not_exists=True).compile(conn))
+                conn.exec_driver_sql(
+                    re.sub(r"^CREATE (UNIQUE )?INDEX", r"\g<0> CONCURRENTLY", ddl)
+                )
+
+    def analyze_tables(self):
+        """Refreshes planner statistics of all tables"""
+        with self.engine.begin() as conn:
+            for table in self.base.metadata.sorted_tables:
+                conn.execute(text(f"ANALYZE {table.name}"))
+
+    def init_data(
+        self,
+        rows: int = settings.INITIAL_DATA_COUNT,
+        reset: bool = True,
+        workers: int = settings.GENERATION_WORKERS,
+        seed: int | None = None,
+        engine: str = settings.GENERATION_ENGINE,
+        chunk_size: int = settings.GENERATION_CHUNK_SIZE,
+        progress: Callable[[int, int], None] | None = None,
+        defer_indexes: bool | None = None,
+        concurrent_indexes: bool = False,
+        snapshot: bool = False,
+    ):
         """
         Generates initial dataset including positions and employees hierarchy.
         :param rows: Count of records to be added.
         :type rows: int
         :param reset: Flag for deleting all previous data in all tables.
         :type reset: bool
+        :param workers: Number of generator processes. 1 generates in-process.
+        :type workers: int
+        :param seed: Base seed of generators. Random if None.
+        :type seed: int | None
+        :param engine: Generation engine: "mimesis" (row by row), "numpy"
+                       (columnar batches drawn from precomputed name pools)
+                       or "sql" (set-based generation inside PostgreSQL,
+                       see _load_employees_sql())
+        :type engine: str
+        :param chunk_size: Rows generated, written and committed at once
+        :type chunk_size: int
+        :param progress: Called as progress(done, total) after every chunk
+        :type progress: Callable[[int, int], None] | None
+        :param defer_indexes: Drop secondary indexes before the load and
+                              rebuild them afterwards. Defaults to reset.
+        :type defer_indexes: bool | None
+        :param concurrent_indexes: Rebuild deferred indexes concurrently
+        :type concurrent_indexes: bool
+        :param snapshot: Reload dataset from snapshot keyed by seed, rows,
+                         locale, engine and chunk size if it exists, or save
+                         generated dataset as such snapshot otherwise.
+                         Requires seed and reset=True.
+        :type snapshot: bool
 
         Process flow:
             1. Truncates tables and recreates position hierarchy if reset=True
+               Drops secondary indexes of employees if defer_indexes=True
             2. Distributes employees across 5 hierarchy levels:
             3. Automatically assigns managers from higher hierarchy levels
+            4. Shards every level into chunks generated by a process pool
+            5. Streams chunks into database with COPY as they arrive
+               (see copy_employees()), committing after every chunk
+            6. Rebuilds dropped indexes and runs ANALYZE on all tables
 
         Example usage:
             Generate 50,000 employees with clean setup
@@ -77,12 +1240,42 @@ class EmployeeCatalog:
             Add 1000 employees to existing data
             init_data(rows=1000, reset=False)
 
+            Reproducible dataset, generated once and reloaded afterwards
+            init_data(rows=1_000_000, seed=42, snapshot=True)
+
         Data generation rules:
             - Position distribution follows POSITION_HIERARCHY structure
             - Manager assignment respects organizational hierarchy
             - Salary and hire dates generated by Faker methods
             - Names localized based on configured language
+            - Employee IDs are reserved per level before loading, so
+              managers of the next level are picked without RETURNING
+            - Every chunk is seeded from seed and its first ID, so the same
+              seed gives the same data regardless of workers count
+
+        Memory usage:
+            - Only 2 * workers chunks are generated ahead of the database
+            - Manager IDs of a freshly generated level are kept as range
+            - Existing manager IDs (reset=False) are streamed into a compact
+              int64 array instead of a list of Python ints
+            So peak memory depends on chunk_size, not on rows.
         """
+        if engine != "sql" and engine not in GENERATION_ENGINES:
+            raise ValueError(f"Unknown generation engine: {engine}")
+        if snapshot:
+            if seed is None or not reset or engine == "sql":
+                raise ValueError(
+                    "Snapshots require seed, reset and client-side generation engine"
+                )
+            path = snapshot_path(
+                seed=seed,
+                rows=rows,
+                language=settings.LANGUAGE,
+                engine=engine,
+                chunk_size=chunk_size,
+            )
+        else:
+            path = None
         if reset:
             self.truncate_all_tables()
             with Session(self.engine) as session:
@@ -91,39 +1284,380 @@ class EmployeeCatalog:
                     data.append(Position(title=title, level=level))
                 session.bulk_save_objects(data)
                 session.commit()
-        emp_count = rows
-        for level in range(1, 6):
-            with Session(self.engine) as session:
+        if seed is None:
+            seed = random.randrange(2**63)
+        if defer_indexes is None:
+            defer_indexes = reset
+        if defer_indexes:
+            self.drop_secondary_indexes()
+        try:
+            if path is not None and path.exists():
+                self._load_snapshot(path=path, rows=rows, progress=progress)
+            elif engine == "sql":
+                self._load_employees_sql(rows=rows, seed=seed, progress=progress)
+            else:
+                self._load_employees(
+                    rows=rows,
+                    reset=reset,
+                    workers=workers,
+                    seed=seed,
+                    engine=engine,
+                    chunk_size=chunk_size,
+                    progress=progress,
+                    snapshot_path=path,
+                )
+        finally:
+            self.cache.clear()
+            self._org_index = None
+            if defer_indexes:
+                self.create_secondary_indexes(concurrently=concurrent_indexes)
+        self.analyze_tables()
+
+    def _load_employees(
+        self,
+        rows: int,
+        reset: bool,
+        workers: int,
+        seed: int,
+        engine: str,
+        chunk_size: int,
+        progress: Callable[[int, int], None] | None,
+        snapshot_path: Path | None = None,
+    ):
+        """
+        Generates and loads employees level by level, see init_data().
+        Every loaded chunk is also written to snapshot_path if given.
+        """
+        generate = GENERATION_ENGINES[engine]
+        if workers > 1:
+            pool = ProcessPoolExecutor(max_workers=workers)
+        else:
+            pool = nullcontext()
+        if snapshot_path is not None:
+            writer = SnapshotWriter(snapshot_path)
+        else:
+            writer = nullcontext()
+        done = 0
+        with pool as executor, writer:
+            manager_ids = None
+            for level, count in self._level_counts(rows).items():
+                with self.engine.begin() as conn:
+                    stmt = select(Position.id).where(Position.level == level)
+                    position_ids = list(conn.scalars(stmt))
+                    if level != 1 and (not reset or manager_ids is None):
+                        stmt = (
+                            select(Employee.id)
+                            .join(Position)
+                            .where(Position.level == level - 1)
+                            .execution_options(yield_per=chunk_size)
+                        )
+                        manager_ids = np.fromiter(conn.scalars(stmt), dtype=np.int64)
+                    if level != 1:
+                        self._check_managers(level, len(manager_ids))
+                    ids = self.reserve_employee_ids(conn, count)
+                tasks = split_tasks(
+                    seed=seed,
+                    ids=ids,
+                    position_ids=position_ids,
+                    manager_ids=manager_ids if level != 1 else None,
+                    chunk_size=chunk_size,
+                )
+                if executor is None:
+                    chunks = map(generate, tasks)
+                else:
+                    chunks = bounded_map(executor, generate, tasks, window=2 * workers)
+                for chunk in chunks:
+                    with self.engine.begin() as conn:
+                        if engine == "numpy":
+                            done += self.copy_employee_batches([chunk], connection=conn)
+                        else:
+                            done += self.copy_employees(chunk, connection=conn)
+                    if snapshot_path is not None:
+                        if engine != "numpy":
+                            chunk = ColumnBatch.from_rows(chunk)
+                        writer.write(chunk)
+                    if progress:
+                        progress(done, rows)
+                manager_ids = ids
+
+    def _load_snapshot(
+        self,
+        path: Path,
+        rows: int,
+        progress: Callable[[int, int], None] | None,
+    ):
+        """
+        Loads dataset snapshot saved by _load_employees() chunk by chunk.
+        Snapshot keeps employee IDs, so ID sequence is moved past them.
+        """
+        done = 0
+        for batch in read_snapshot(path):
+            with self.engine.begin() as conn:
+                done += self.copy_employee_batches([batch], connection=conn)
+            if progress:
+                progress(done, rows)
+        with self.engine.begin() as conn:
+            conn.execute(
+                select(
+                    func.setval(
+                        func.pg_get_serial_sequence(Employee.__tablename__, "id"),
+                        select(func.coalesce(func.max(Employee.id), 0) + 1)
+                        .scalar_subquery(),
+                        False,
+                    )
+                )
+            )
+
+    def _load_employees_sql(
+        self,
+        rows: int,
+        seed: int,
+        progress: Callable[[int, int], None] | None,
+    ):
+        """
+        Generates employees inside PostgreSQL, one INSERT ... SELECT per level.
+
+        Implementation Details:
+            - Name pools (see core.generators.build_name_pools) are stored
+              once in temporary lookup table gen_names, one row per name
+              keyed by (kind, gender, idx); rows join it on a random idx,
+              so no name array is read per row
+            - Rows come from generate_series(), every value is drawn with
+              random() seeded by setseed() before any join, and IDs are
+              reserved up front (see reserve_employee_ids()), so same seed
+              gives same data whatever plan the joins get
+            - Managers are drawn by random row number from previous level,
+              level without any managers is an error
+            - Levels follow the same distribution as _load_employees()
+            - Every level is generated into staging table and moved into
+              employees like COPY chunks (see _insert_loaded())
+        """
+        pools = build_name_pools(settings.LANGUAGE, seed)
+        lookups = [("first_name", pools.first_names), ("last_name", pools.last_names)]
+        if pools.patronymics:
+            lookups.append(("patronymic", pools.patronymics))
+        with self.engine.connect() as conn:
+            conn.execute(
+                text(
+                    "CREATE TEMPORARY TABLE IF NOT EXISTS gen_names "
+                    "(kind text, gender int, idx int, name text, "
+                    "PRIMARY KEY (kind, gender, idx))"
+                )
+            )
+            conn.execute(text("TRUNCATE gen_names"))
+            with conn.connection.driver_connection.cursor() as cursor:
+                with cursor.copy(
+                    "COPY gen_names (kind, gender, idx, name) FROM STDIN"
+                ) as copy:
+                    for kind, pool in lookups:
+                        for gender, names in enumerate(pool):
+                            for idx, name in enumerate(names.tolist()):
+                                copy.write_row((kind, gender, idx, name))
+            conn.execute(text("ANALYZE gen_names"))
+            conn.execute(select(func.setseed(seed % 1_000_000 / 1_000_000)))
+            date_span = int((HIRE_DATE_END - HIRE_DATE_START).astype(int)) + 1
+            done = 0
+            for level, count in self._level_counts(rows).items():
+                position_ids = list(
+                    conn.scalars(select(Position.id).where(Position.level == level))
+                )
                 if level != 1:
                     stmt = (
-                        select(Employee.id)
+                        select(func.count())
+                        .select_from(Employee)
                         .join(Position)
                         .where(Position.level == level - 1)
                     )
-                    manager_ids = list(session.scalars(stmt))
-                data = []
-                stmt = select(Position.id).where(Position.level == level)
-                position_ids = list(session.scalars(stmt))
-                if not position_ids:
-                    continue
-                if level == 5:
-                    count = emp_count
-                else:
-                    managers_count = int((0.1 ** (5 - level)) * rows)
-                    emp_count -= managers_count
-                    count = managers_count
-                for _ in range(count):
-                    position_id = random.choice(position_ids)
-                    if level != 1:
-                        manager_id = random.choice(manager_ids)
-                    else:
-                        manager_id = None
-                    manager = self.generate_employee(
-                        position_id=position_id, manager_id=manager_id
+                    self._check_managers(level, conn.scalar(stmt))
+                ids = self.reserve_employee_ids(conn, count)
+                conn.execute(SQL_CREATE_LOAD_TABLE)
+                conn.execute(
+                    SQL_GENERATE_LEVEL,
+                    {
+                        "first_id": ids.start,
+                        "count": count,
+                        "level": level,
+                        "position_ids": position_ids,
+                        "date_start": HIRE_DATE_START.item(),
+                        "date_span": date_span,
+                    },
+                )
+                self._insert_loaded(conn)
+                conn.commit()
+                done += count
+                if progress:
+                    progress(done, rows)
+            conn.execute(text("DROP TABLE gen_names"))
+            conn.commit()
+
+    @staticmethod
+    def _check_managers(level: int, count: int):
+        """
+        Fails generation of a level that has nobody to report to, instead of
+        writing employees without managers.
+        """
+        if not count:
+            raise ValueError(
+                f"No employees on level {level - 1} to manage level {level}, "
+                "increase rows"
+            )
+
+    def _level_counts(self, rows: int) -> Dict[int, int]:
+        """
+        Distributes rows across hierarchy levels that have positions.
+
+        Level N (N < 5) gets 0.1 ** (5 - N) * rows employees,
+        level 5 gets the rest.
+        """
+        with Session(self.engine) as session:
+            levels = set(session.scalars(select(Position.level).distinct()))
+        counts = {}
+        emp_count = rows
+        for level in range(1, 6):
+            if level not in levels:
+                continue
+            if level == 5:
+                counts[level] = emp_count
+            else:
+                managers_count = int((0.1 ** (5 - level)) * rows)
+                emp_count -= managers_count
+                counts[level] = managers_count
+        return counts
+
+    def reserve_employee_ids(self, connection: Connection, count: int) -> range:
+        """
+        Reserves a contiguous block of employee IDs without RETURNING.
+
+        :param connection: Open connection; the reservation holds until its
+                           transaction ends
+        :type connection: Connection
+        :param count: Number of IDs to reserve
+        :type count: int
+
+        :return: Reserved IDs in ascending order
+        :rtype: range
+
+        Implementation Details:
+            - Locks employees table against concurrent writers
+            - Block is taken from the ID sequence itself: it starts at
+              nextval() and the sequence is moved past the block in the
+              same statement, so it never goes backwards and IDs of
+              deleted employees are not reused
+            - Block also starts after the current maximum ID, in case rows
+              were inserted with explicit IDs
+        """
+        connection.execute(text("LOCK TABLE employees IN SHARE ROW EXCLUSIVE MODE"))
+        if count <= 0:
+            return range(0)
+        sequence = func.pg_get_serial_sequence(Employee.__tablename__, "id")
+        last = connection.scalar(
+            select(
+                func.setval(
+                    sequence,
+                    func.greatest(
+                        func.nextval(sequence),
+                        select(func.coalesce(func.max(Employee.id), 0) + 1)
+                        .scalar_subquery(),
                     )
-                    data.append(manager)
-                session.bulk_save_objects(data)
-                session.commit()
+                    + count
+                    - 1,
+                )
+            )
+        )
+        return range(last - count + 1, last + 1)
+
+    def copy_employees(
+        self, rows: Iterable[Sequence], connection: Connection | None = None
+    ) -> int:
+        """
+        Streams employee rows into the database with COPY ... FROM STDIN.
+
+        :param rows: Iterable of tuples in EMPLOYEE_COPY_COLUMNS order
+        :type rows: Iterable[Sequence]
+        :param connection: Connection to load through. If None, a new
+                           transaction is opened and committed.
+        :type connection: Connection | None
+
+        :return: Number of copied rows
+        :rtype: int
+
+        Example usage:
+            with catalog.engine.begin() as conn:
+                ids = catalog.reserve_employee_ids(conn, 2)
+                catalog.copy_employees(
+                    [catalog.generate_employee_row(id=i, position_id=1) for i in ids],
+                    connection=conn,
+                )
+
+        Notes:
+            1. Rows are not passed through ORM, so before_flush validation
+               is skipped. Callers are responsible for hierarchy rules.
+            2. Generator input is consumed lazily, nothing is buffered.
+            3. Rows are copied into staging table and moved into employees
+               with one INSERT ... SELECT computing org_path and
+               search_vector, so per-row triggers do not slow COPY down.
+        """
+        if connection is None:
+            with self.engine.begin() as conn:
+                return self.copy_employees(rows, connection=conn)
+        copied = 0
+        with self._copy_employees(connection) as copy:
+            for row in rows:
+                copy.write_row(row)
+                copied += 1
+        return copied
+
+    def copy_employee_batches(
+        self, batches: Iterable[ColumnBatch], connection: Connection | None = None
+    ) -> int:
+        """
+        Streams columnar employee batches into the database with COPY.
+
+        :param batches: Iterable of ColumnBatch (see core.generators)
+        :type batches: Iterable[ColumnBatch]
+        :param connection: Connection to load through. If None, a new
+                           transaction is opened and committed.
+        :type connection: Connection | None
+
+        :return: Number of copied rows
+        :rtype: int
+
+        Notes:
+            Every batch is sent as one block of COPY text, so the cost is
+            dominated by the transfer rather than by per-row adaptation.
+        """
+        if connection is None:
+            with self.engine.begin() as conn:
+                return self.copy_employee_batches(batches, connection=conn)
+        copied = 0
+        with self._copy_employees(connection) as copy:
+            for batch in batches:
+                copy.write(batch.to_copy_text())
+                copied += len(batch)
+        return copied
+
+    @contextmanager
+    def _copy_employees(self, connection: Connection):
+        """
+        Opens COPY into staging table on the psycopg connection and moves
+        copied rows into employees when the block ends
+        """
+        columns = ", ".join(EMPLOYEE_COPY_COLUMNS)
+        connection.execute(SQL_CREATE_LOAD_TABLE)
+        with connection.connection.driver_connection.cursor() as cursor:
+            with cursor.copy(f"COPY employees_load ({columns}) FROM STDIN") as copy:
+                yield copy
+        self._insert_loaded(connection)
+
+    def _insert_loaded(self, connection: Connection):
+        """
+        Moves rows of employees_load into employees with org_path and
+        search_vector computed in one statement, row triggers skipped
+        """
+        connection.execute(SQL_BULK_LOAD_ON)
+        connection.execute(SQL_INSERT_LOADED)
+        connection.execute(SQL_BULK_LOAD_OFF)
+        connection.execute(SQL_DROP_LOAD_TABLE)
 
     def generate_employee(
         self, position_id: int | None = None, manager_id: int | None = None
@@ -163,25 +1697,108 @@ class EmployeeCatalog:
             - Hire dates are uniformly distributed in range
 
         """
-        data = {}
-        gender = random.choice([Gender.MALE, Gender.FEMALE])
-        data["first_name"] = self.person.first_name(gender=gender)
-        data["last_name"] = self.person.last_name(gender=gender)
-        if settings.LANGUAGE == "ru":
-            rsp = RussiaSpecProvider()
-            data["patronymic"] = rsp.patronymic(gender=gender)
-        data["hire_date"] = self.datetime.date(start=2015, end=2024)
-        data["salary"] = self.finance.price(minimum=30000, maximum=300000)
+        data = self._generate_employee_data()
         data["position_id"] = position_id
         if manager_id:
             data["manager_id"] = manager_id
         return Employee(**data)
 
+    def generate_employee_row(
+        self,
+        id: int,
+        position_id: int | None = None,
+        manager_id: int | None = None,
+    ) -> tuple:
+        """
+        Generates a random employee as a plain row for copy_employees().
+
+        :param id: Pre-reserved employee ID (see reserve_employee_ids())
+        :param position_id: ID of the position for the employee
+        :param manager_id: ID of the manager for the employee
+        :return: Tuple in EMPLOYEE_COPY_COLUMNS order
+        """
+        return self.generator.employee_row(
+            id=id, position_id=position_id, manager_id=manager_id
+        )
+
+    def _generate_employee_data(self) -> dict:
+        """Generates name, hire date and salary fields of employee"""
+        return self.generator.employee_data()
+
     def get_employees_list(
-        self, sort_opts: List[Dict] = [], filter_opts: List[Dict] = [], limit: int = 10
-    ) -> List[Employee]:
+        self,
+        sort_opts: List[Dict] = [],
+        filter_opts: List[Dict] = [],
+        limit: int = 10,
+        projection: bool = False,
+    ) -> List[Employee] | List[EmployeeRecord]:
         """
         Retrieves a list of employees with filtering, sorting and limit capabilities.
+        First page of get_employees_page(), see it for parameters.
+
+        :return: List of employees with loaded position and manager
+                 relationships, or EmployeeRecord tuples if projection=True
+        :rtype: List[Employee] | List[EmployeeRecord]
+        """
+        return self.get_employees_page(
+            sort_opts=sort_opts,
+            filter_opts=filter_opts,
+            limit=limit,
+            projection=projection,
+        ).rows
+
+    def get_employees_page(
+        self,
+        sort_opts: List[Dict] = [],
+        filter_opts: List[Dict] = [],
+        limit: int = 10,
+        after: str | None = None,
+        before: str | None = None,
+        projection: bool = False,
+        count: bool = False,
+        exact_count: bool = False,
+    ) -> EmployeePage:
+        """
+        Retrieves a page of employees, served from list cache when possible.
+        See _fetch_employees_page() for parameters.
+
+        Cache is keyed by normalized (sort_opts, filter_opts, limit, cursor)
+        and dropped by every write of this catalog (create_employee(),
+        update_employee(), delete_employee(), init_data(),
+        import_employees()). Writes of other processes are caught up with
+        after LIST_CACHE_TTL seconds.
+        """
+        key = freeze(
+            (sort_opts, filter_opts, limit, after, before, projection, count, exact_count)
+        )
+        found, page = self.cache.get(key)
+        if not found:
+            page = self._fetch_employees_page(
+                sort_opts=sort_opts,
+                filter_opts=filter_opts,
+                limit=limit,
+                after=after,
+                before=before,
+                projection=projection,
+                count=count,
+                exact_count=exact_count,
+            )
+            self.cache.set(key, page)
+        return page._replace(rows=list(page.rows))
+
+    def _fetch_employees_page(
+        self,
+        sort_opts: List[Dict] = [],
+        filter_opts: List[Dict] = [],
+        limit: int = 10,
+        after: str | None = None,
+        before: str | None = None,
+        projection: bool = False,
+        count: bool = False,
+        exact_count: bool = False,
+    ) -> EmployeePage:
+        """
+        Retrieves a page of employees with filtering, sorting and keyset pagination.
 
         :param sort_opts: Sorting options in format:
             [{
@@ -192,16 +1809,37 @@ class EmployeeCatalog:
 
         :param filter_opts: Filter conditions in format:
             [{
-                'field': field to filter by (id/name/position/date/salary/manager),
-                'value': filter value
+                'field': field to filter by (id/name/position/date/salary/manager,
+                         or under - all subordinates of employee with ID value),
+                'value': filter value, (low, high) pair for 'between',
+                'op': =, >, <, >=, <= or between (date/salary only, default =)
             }]
         :type filter_opts: List[Dict]
 
         :param limit: Maximum number of records to return
         :type limit: int
 
-        :return: List of employees with loaded position and manager relationships
-        :rtype: List[Employee]
+        :param after: Cursor of page, returns rows following it (next_cursor)
+        :type after: str | None
+
+        :param before: Cursor of page, returns rows preceding it (prev_cursor)
+        :type before: str | None
+
+        :param projection: Select only displayed columns into EmployeeRecord
+                           tuples with Core, bypassing ORM entities
+        :type projection: bool
+
+        :param count: Fill total with count of all matching employees,
+                      estimated for large results (see count_employees())
+        :type count: bool
+
+        :param exact_count: Always count exactly, implies count
+        :type exact_count: bool
+
+        :return: Employees with loaded position and manager relationships
+                 (or EmployeeRecord tuples) and opaque cursors of neighbour
+                 pages (None if no page)
+        :rtype: EmployeePage
 
         Usage examples:
             Filter by position and sort by salary:
@@ -216,153 +1854,627 @@ class EmployeeCatalog:
             Get employees hired in 2023:
                 get_employees_list(filter_opts=[{'field': 'date', 'value': '2023'}])
 
+            Get salaries between 100k and 150k:
+                get_employees_list(filter_opts=[
+                    {'field': 'salary', 'op': 'between', 'value': ('100000', '150000')}
+                ])
+
+            Browse by pages:
+                page = get_employees_page(sort_opts=[...], limit=50)
+                page = get_employees_page(sort_opts=[...], limit=50, after=page.next_cursor)
+
         Features:
             - Date filter supports formats: Year (YYYY), Year-Month (YYYY-MM), Full date (YYYY-MM-DD)
+            - Date and salary filters compile into range predicates on raw
+              columns, served by idx_emp_hire_date / idx_emp_salary
             - Name/manager search performs case-insensitive substring matching
+              over full_name_expression(), served by trigram index
+              idx_emp_full_name_trgm; manager search selects matching manager
+              IDs instead of filtering the joined rows
             - Name/manager sorting follows order: Last Name -> First Name -> Patronymic
+            - Subtree filter (under) is one org_path <@ lookup by GiST index
+              idx_emp_org_path, whatever depth of subtree
             - Position filtering uses titles from related Position table
+            - Pagination seeks by (sort keys, id) instead of OFFSET, so any page
+              costs the same as the first one
+            - Employee.id is always added as the last sort key to make order total
+            - NULL name parts are sorted as empty strings
+            - Projection mode skips identity map, instrumentation and
+              relationship loading: rows are plain tuples of 10 columns,
+              several times cheaper for large listings
         """
-        PositionAlias = aliased(Position)
-        ManagerAlias = aliased(Employee)
-        stmt = select(Employee).options(
-            joinedload(Employee.position.of_type(PositionAlias)),
-            joinedload(Employee.manager.of_type(ManagerAlias)),
+        PositionAlias = ListPosition
+        ManagerAlias = ListManager
+        sort_keys = self._sort_keys(sort_opts, PositionAlias, ManagerAlias)
+        if projection:
+            columns = EMPLOYEE_RECORD_COLUMNS
+            stmt = select_employee_records(*[key for key, _ in sort_keys])
+        else:
+            columns = [Employee]
+            stmt = select(Employee, *[key for key, _ in sort_keys]).options(
+                joinedload(Employee.position.of_type(PositionAlias)),
+                joinedload(Employee.manager.of_type(ManagerAlias)),
+            )
+        filter_stmt = self._employee_filters(filter_opts)
+        if count or exact_count:
+            total, total_exact = self.count_employees(filter_opts, exact=exact_count)
+        else:
+            total, total_exact = None, False
+        if filter_stmt:
+            stmt = stmt.filter(*filter_stmt)
+        backward = before is not None
+        cursor = before if backward else after
+        if cursor is not None:
+            values = self._decode_cursor(cursor, sort_keys)
+            stmt = stmt.filter(self._keyset_predicate(sort_keys, values, backward))
+        order_by_fields = [
+            key.desc() if descending != backward else key.asc()
+            for key, descending in sort_keys
+        ]
+        stmt = stmt.order_by(*order_by_fields).limit(limit + 1)
+        if projection:
+            with self.engine.connect() as conn:
+                rows = conn.execute(stmt).all()
+        else:
+            with Session(self.engine) as session:
+                rows = session.execute(stmt).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if not rows:
+            return EmployeePage(
+                rows=[],
+                next_cursor=None,
+                prev_cursor=None,
+                total=total,
+                total_exact=total_exact,
+            )
+        if backward:
+            rows.reverse()
+            has_next, has_prev = True, has_more
+        else:
+            has_next, has_prev = has_more, after is not None
+        n = len(columns)
+        if projection:
+            records = [EmployeeRecord._make(row[:n]) for row in rows]
+        else:
+            records = [row[0] for row in rows]
+        return EmployeePage(
+            rows=records,
+            next_cursor=self._encode_cursor(rows[-1][n:]) if has_next else None,
+            prev_cursor=self._encode_cursor(rows[0][n:]) if has_prev else None,
+            total=total,
+            total_exact=total_exact,
         )
+
+    def search(self, query: str, limit: int = 10) -> List[EmployeeRecord]:
+        """
+        Full-text search of employees by name parts and position title.
+
+        :param query: Free text in websearch syntax: words are combined
+                      with AND, "quoted phrase", "or", -excluded word.
+                      E.g. "smirnov developer".
+        :type query: str
+        :param limit: Maximum number of records to return
+        :type limit: int
+
+        :return: Matching employees, most relevant first
+        :rtype: List[EmployeeRecord]
+
+        Features:
+            - Served by GIN index idx_emp_search over search_vector column,
+              no substring scans
+            - Words are stemmed with text search configuration of
+              settings.LANGUAGE, so different forms of a word match
+            - Ranked by ts_rank, name matches outweigh position matches;
+              equal ranks are ordered by ID
+        """
+        with self.engine.connect() as conn:
+            rows = conn.execute(STMT_SEARCH, {"query": query, "limit": limit})
+            return [EmployeeRecord._make(row) for row in rows]
+
+    def refresh_salary_stats(self):
+        """
+        Recomputes salary statistics view without blocking its readers.
+        Writes committed during refresh mark it stale again.
+        """
+        # Separate transactions, so the state row is not locked during
+        # refresh and writers are not blocked by their triggers
+        for statement in SQL_STATS_REFRESH:
+            with self.engine.begin() as conn:
+                conn.execute(statement)
+
+    def get_salary_stats(
+        self, by: str = "position", refresh: bool | None = None
+    ) -> List[SalaryStats]:
+        """
+        Returns headcount and salary distribution per group of employees.
+
+        :param by: Grouping: "position", "level", "year" (of hire) or
+                   "total" (one row for all employees)
+        :type by: str
+        :param refresh: True recomputes statistics, False returns them as
+                        they are, None (default) recomputes only if
+                        employees or positions changed since last refresh
+        :type refresh: bool | None
+
+        :return: Groups ordered by level, hire year and position title.
+                 Key is position title, level or year
+        :rtype: List[SalaryStats]
+
+        Features:
+            - Served from materialized view employee_salary_stats, so
+              repeated calls do not scan employees table
+            - All groupings are computed by one scan with GROUPING SETS,
+              quartiles and 90th percentile by one sort per group
+            - Staleness is tracked by statement triggers, so writes of
+              other processes (and bulk loads) are noticed as well
+        """
+        if by not in STATS_DIMENSIONS:
+            raise ValueError(f"Unknown statistics grouping: {by}")
+        if refresh is None:
+            with self.engine.connect() as conn:
+                refresh = conn.scalar(SQL_STATS_IS_STALE)
+        if refresh:
+            self.refresh_salary_stats()
+        with self.engine.connect() as conn:
+            rows = conn.execute(STMT_SALARY_STATS, {"dimension": by})
+            return [SalaryStats._make(row) for row in rows]
+
+    def get_reporting_chain(self, employee_id: int) -> List[ChainLink]:
+        """
+        Returns chain of command of employee up to CEO.
+
+        :param employee_id: ID of employee
+        :type employee_id: int
+
+        :return: The employee, its direct manager and so on up to CEO,
+                 empty list if there is no such employee
+        :rtype: List[ChainLink]
+
+        Implementation Details:
+            - IDs of all managers are taken from employee's org_path, so
+              names and positions are read by primary key in one query
+              (STMT_REPORTING_CHAIN), no round trip per level
+            - With ORG_INDEX enabled, chain is taken from org_index and
+              only names and positions are read
+        """
+        index = self.org_index
+        if index is not None:
+            if employee_id not in index:
+                return []
+            ids = [employee_id, *index.ancestors(employee_id)]
+            with self.engine.connect() as conn:
+                labels = {
+                    row.id: row
+                    for row in conn.execute(STMT_EMPLOYEE_LABELS, {"ids": ids})
+                }
+            rows = (
+                SimpleNamespace(**labels[id]._asdict(), distance=distance)
+                for distance, id in enumerate(ids)
+                if id in labels
+            )
+        else:
+            with self.engine.connect() as conn:
+                rows = conn.execute(
+                    STMT_REPORTING_CHAIN, {"employee_id": employee_id}
+                ).all()
+        return [
+            ChainLink(
+                id=row.id,
+                full_name=format_full_name(
+                    row.last_name, row.first_name, row.patronymic
+                ),
+                position_title=row.position_title,
+                distance=row.distance,
+            )
+            for row in rows
+        ]
+
+    def get_span_of_control(
+        self, min_reports: int = 0, limit: int = 10
+    ) -> SpanOfControl | None:
+        """
+        Returns span of control statistics of all managers.
+
+        :param min_reports: Managers with fewer direct reports are not
+                            listed and not counted as over_threshold
+        :type min_reports: int
+        :param limit: Maximum number of listed managers and deepest chains
+        :type limit: int
+
+        :return: Statistics, None if nobody has subordinates
+        :rtype: SpanOfControl | None
+
+        Implementation Details:
+            - Direct and total reports of every manager are counted in one
+              scan of employees by unnesting org_path (STMT_SPAN_OF_CONTROL),
+              so cost does not depend on number of managers
+            - Deepest chains are read in org_path depth order from
+              idx_emp_org_depth (STMT_DEEPEST_CHAINS)
+        """
+        with self.engine.connect() as conn:
+            spans = conn.execute(
+                STMT_SPAN_OF_CONTROL, {"min_reports": min_reports, "limit": limit}
+            ).all()
+            deepest = conn.execute(STMT_DEEPEST_CHAINS, {"limit": limit}).all()
+        if not spans:
+            return None
+        return SpanOfControl(
+            managers=spans[0].managers,
+            over_threshold=spans[0].over_threshold,
+            average_span=spans[0].average_span,
+            max_depth=deepest[0].depth,
+            # Rows are ordered by direct reports, so matching ones go first
+            widest=[
+                ManagerSpan(
+                    id=row.id,
+                    full_name=format_full_name(
+                        row.last_name, row.first_name, row.patronymic
+                    ),
+                    position_title=row.position_title,
+                    depth=row.depth,
+                    direct_reports=row.direct_reports,
+                    total_reports=row.total_reports,
+                )
+                for row in spans
+                if row.direct_reports >= min_reports
+            ],
+            deepest=[
+                DeepChain(
+                    id=row.id,
+                    full_name=format_full_name(
+                        row.last_name, row.first_name, row.patronymic
+                    ),
+                    position_title=row.position_title,
+                    depth=row.depth,
+                    path=row.path,
+                )
+                for row in deepest
+            ],
+        )
+
+    def get_rollups(
+        self, root_id: int | None = None, ids: Iterable[int] | None = None
+    ) -> Dict[int, SubtreeRollup]:
+        """
+        Returns headcount, payroll and average salary of subtrees.
+
+        :param root_id: Read only subtree of this employee, all employees
+                        if None
+        :type root_id: int | None
+        :param ids: Employees to return rollups of, all if None. Needs
+                    root_id, and all of them should be in its subtree
+        :type ids: Iterable[int] | None
+
+        :return: Rollup by employee ID, subtree includes the employee
+        :rtype: Dict[int, SubtreeRollup]
+
+        Implementation Details:
+            - Computed bottom-up in one scan (STMT_ROLLUPS): every employee
+              is added to each label of its org_path, then grouped
+            - With root_id only rows of its subtree are read (GiST index on
+              org_path), so rollups of displayed nodes of a tree cost one
+              pass over the tree, whatever number of nodes
+        """
+        with self.engine.connect() as conn:
+            if root_id is None:
+                rows = conn.execute(STMT_ROLLUPS)
+            else:
+                rows = conn.execute(
+                    STMT_SUBTREE_ROLLUPS,
+                    {
+                        "root_id": root_id,
+                        "ids": [root_id] if ids is None else list(ids),
+                    },
+                )
+            return {
+                row.id: SubtreeRollup(
+                    headcount=row.headcount,
+                    payroll=row.payroll,
+                    average_salary=row.average_salary,
+                )
+                for row in rows
+            }
+
+    def count_subordinates(self, root_id: int) -> int:
+        """
+        Returns number of direct and indirect subordinates of employee,
+        one GiST index lookup over org_path whatever depth of subtree,
+        or no query at all when org index is enabled
+        """
+        index = self.org_index
+        if index is not None:
+            return index.subtree_size(root_id)
+        with self.engine.connect() as conn:
+            size = conn.scalar(STMT_SUBTREE_SIZE, {"root_id": root_id})
+        return max(size - 1, 0)
+
+    def count_employees(
+        self, filter_opts: List[Dict] = [], exact: bool = False
+    ) -> tuple[int, bool]:
+        """
+        Counts employees matching filter options of get_employees_page().
+
+        :param filter_opts: Filter conditions, see get_employees_page()
+        :type filter_opts: List[Dict]
+        :param exact: Always run COUNT(*) instead of using estimates
+        :type exact: bool
+
+        :return: (count, True if exact or False if estimated)
+        :rtype: tuple[int, bool]
+
+        Features:
+            - Unfiltered count is taken from pg_class.reltuples, filtered
+              one from row estimate of EXPLAIN; neither reads the table
+            - Estimates below COUNT_EXACT_THRESHOLD are replaced by
+              COUNT(*), which is cheap for such small results
+            - Counting does not join positions and managers unless a
+              filter needs them
+        """
+        conditions = self._employee_filters(filter_opts)
+        stmt = select(Employee.id)
+        if any(f["field"] == "position" for f in filter_opts):
+            stmt = stmt.join(ListPosition, Employee.position_id == ListPosition.id)
+        stmt = stmt.where(*conditions)
+        with self.engine.connect() as conn:
+            if not exact:
+                if conditions:
+                    estimate = self._estimate_rows(conn, stmt)
+                else:
+                    estimate = conn.scalar(STMT_EMPLOYEES_RELTUPLES)
+                if estimate >= settings.COUNT_EXACT_THRESHOLD:
+                    return estimate, False
+            total = conn.scalar(select(func.count()).select_from(stmt.subquery()))
+            return total, True
+
+    def _estimate_rows(self, conn: Connection, stmt) -> int:
+        """Returns planner estimate of rows returned by stmt"""
+        compiled = stmt.compile(
+            dialect=conn.dialect, compile_kwargs={"render_postcompile": True}
+        )
+        plan = conn.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+        ).scalar()
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def _employee_filters(self, filter_opts: List[Dict]) -> list:
+        """
+        Converts filter options of get_employees_page() into WHERE clauses.
+        Position filter refers to ListPosition, which must be joined.
+        """
         filter_stmt = []
         for f in filter_opts:
+            if f.get("op", "=") != "=" and f["field"] not in ("date", "salary"):
+                raise ValueError(f"Operator {f['op']} is not supported for {f['field']}")
             match f["field"]:
                 case "id":
                     filter_stmt.append(Employee.id == int(f["value"]))
                 case "name":
-                    search_value = f"%{f['value']}%"
-                    filter_expr = func.concat(
-                        Employee.last_name,
-                        " ",
-                        Employee.first_name,
-                        " ",
-                        func.coalesce(Employee.patronymic, ""),
-                    ).ilike(search_value)
-                    filter_stmt.append(filter_expr)
+                    search_value = f"%{f['value'].lower()}%"
+                    filter_stmt.append(full_name_expression(Employee).like(search_value))
                 case "position":
-                    filter_stmt.append(PositionAlias.title.ilike(f"%{f['value']}%"))
+                    filter_stmt.append(ListPosition.title.ilike(f"%{f['value']}%"))
                 case "date":
-                    if "-" in f["value"]:
-                        try:
-                            year, month, day = map(int, f["value"].split("-"))
-                        except ValueError:
-                            raise ValueError("Incorrect date format")
-                        filter_stmt.append(
-                            and_(
-                                func.extract("year", Employee.hire_date) == year,
-                                func.extract("month", Employee.hire_date) == month,
-                                func.extract("day", Employee.hire_date) == day,
+                    filter_stmt.append(
+                        self._range_filter(
+                            Employee.hire_date,
+                            f.get("op", "="),
+                            f["value"],
+                            self._date_range,
+                        )
+                    )
+                case "salary":
+                    filter_stmt.append(
+                        self._range_filter(
+                            Employee.salary,
+                            f.get("op", "="),
+                            f["value"],
+                            self._salary_range,
+                        )
+                    )
+                case "manager":
+                    search_value = f"%{f['value'].lower()}%"
+                    filter_stmt.append(
+                        Employee.manager_id.in_(
+                            select(ManagerSearch.id).where(
+                                full_name_expression(ManagerSearch).like(search_value)
                             )
                         )
-                    elif len(f["value"]) == 4:
-                        try:
-                            year = int(f["value"])
-                        except ValueError:
-                            raise ValueError("Invalid year format. Use 4-digit year")
-                        filter_stmt.append(
-                            func.extract("year", Employee.hire_date) == year
+                    )
+                case "under":
+                    root_id = int(f["value"])
+                    filter_stmt.append(
+                        and_(
+                            Employee.org_path.bool_op("<@")(
+                                select(ManagerSearch.org_path)
+                                .where(ManagerSearch.id == root_id)
+                                .scalar_subquery()
+                            ),
+                            Employee.id != root_id,
                         )
-                    else:
-                        raise ValueError("Incorrect date format")
+                    )
+                case _:
+                    raise ValueError("field not correct")
+        return filter_stmt
+
+    def _range_filter(self, column, op: str, value, to_range: Callable):
+        """
+        Compiles comparison into sargable predicate on raw column.
+
+        :param column: Compared column
+        :param op: One of =, >, <, >=, <=, between
+        :param value: Value, or (low, high) pair for between
+        :param to_range: Converts value into half-open [start, end) range
+                         of column values it stands for
+
+        Every value is treated as a range, e.g. year 2023 is
+        [2023-01-01, 2024-01-01), so "> 2023" means ">= 2024-01-01" and
+        "<= 2023" means "< 2024-01-01". Between includes both bounds,
+        empty bound leaves that end open.
+        """
+        if op == "between":
+            low, high = value
+            if not low and not high:
+                raise ValueError(f"Empty range for {column.key}")
+            bounds = []
+            if low:
+                bounds.append(column >= to_range(low)[0])
+            if high:
+                high_start, high_end = to_range(high)
+                if high_start == high_end:
+                    bounds.append(column <= high_end)
+                else:
+                    bounds.append(column < high_end)
+            return and_(*bounds)
+        start, end = to_range(value)
+        match op:
+            case "=":
+                if start == end:
+                    return column == start
+                return and_(column >= start, column < end)
+            case ">":
+                return column >= end if start != end else column > start
+            case ">=":
+                return column >= start
+            case "<":
+                return column < start
+            case "<=":
+                return column < end if start != end else column <= start
+            case _:
+                raise ValueError(f"Unknown operator: {op}")
+
+    def _date_range(self, value: str) -> tuple:
+        """
+        Returns [start, end) dates of YYYY, YYYY-MM or YYYY-MM-DD prefix.
+        """
+        if not DATE_PREFIX.fullmatch(value):
+            if "-" not in value:
+                raise ValueError("Invalid year format. Use 4-digit year")
+            raise ValueError("Incorrect date format")
+        try:
+            match list(map(int, value.split("-"))):
+                case [year]:
+                    return date(year, 1, 1), date(year + 1, 1, 1)
+                case [year, month]:
+                    start = date(year, month, 1)
+                    end = date(year + month // 12, month % 12 + 1, 1)
+                    return start, end
+                case [year, month, day]:
+                    start = date(year, month, day)
+                    return start, start + timedelta(days=1)
+        except ValueError:
+            raise ValueError("Incorrect date format")
+
+    def _salary_range(self, value: str) -> tuple:
+        """Salary is exact value, so its range is [value, value]"""
+        try:
+            salary = Decimal(value)
+        except ArithmeticError:
+            raise ValueError(messages["errors"]["validation"]["salary"])
+        return salary, salary
+
+    def _sort_keys(
+        self, sort_opts: List[Dict], PositionAlias, ManagerAlias
+    ) -> List[tuple]:
+        """
+        Converts sort options into list of (expression, descending) pairs
+        ending with Employee.id as unique tie-breaker.
+        """
+        keys = []
+        for sort_opt in sort_opts:
+            order_field = sort_opt["order_field"]
+            descending = sort_opt["descending"]
+            match order_field:
+                case "id":
+                    fields = (Employee.id,)
+                case "name":
+                    fields = (
+                        Employee.last_name,
+                        Employee.first_name,
+                        func.coalesce(Employee.patronymic, ""),
+                    )
+                case "position":
+                    fields = (PositionAlias.title,)
+                case "date":
+                    fields = (Employee.hire_date,)
                 case "salary":
-                    filter_stmt.append(Employee.salary == int(f["value"]))
+                    fields = (Employee.salary,)
                 case "manager":
-                    search_value = f"%{f['value']}%"
-                    filter_expr = func.concat(
-                        ManagerAlias.last_name,
-                        " ",
-                        ManagerAlias.first_name,
-                        " ",
+                    fields = (
+                        func.coalesce(ManagerAlias.last_name, ""),
+                        func.coalesce(ManagerAlias.first_name, ""),
                         func.coalesce(ManagerAlias.patronymic, ""),
-                    ).ilike(search_value)
-                    filter_stmt.append(filter_expr)
+                    )
                 case _:
                     raise ValueError("field not correct")
-        if filter_stmt:
-            stmt = stmt.filter(*filter_stmt)
-        if sort_opts:
-            order_by_fields = []
-            for sort_opt in sort_opts:
-                order_field = sort_opt["order_field"]
-                descending = sort_opt["descending"]
-                match order_field:
-                    case "id":
-                        field = Employee.id.desc() if descending else Employee.id
-                    case "name":
-                        field = (
-                            (
-                                Employee.last_name.desc()
-                                if descending
-                                else Employee.last_name
-                            ),
-                            (
-                                Employee.first_name.desc()
-                                if descending
-                                else Employee.first_name
-                            ),
-                            (
-                                Employee.patronymic.desc()
-                                if descending
-                                else Employee.patronymic
-                            ),
-                        )
-                    case "position":
-                        field = (
-                            PositionAlias.title.desc()
-                            if descending
-                            else PositionAlias.title
-                        )
-                    case "date":
-                        field = (
-                            Employee.hire_date.desc()
-                            if descending
-                            else Employee.hire_date
-                        )
-                    case "salary":
-                        field = (
-                            Employee.salary.desc() if descending else Employee.salary
-                        )
-                    case "manager":
-                        field = (
-                            (
-                                ManagerAlias.last_name.desc()
-                                if descending
-                                else ManagerAlias.last_name
-                            ),
-                            (
-                                ManagerAlias.first_name.desc()
-                                if descending
-                                else ManagerAlias.first_name
-                            ),
-                            (
-                                ManagerAlias.patronymic.desc()
-                                if descending
-                                else ManagerAlias.patronymic
-                            ),
-                        )
-                    case _:
-                        raise ValueError("field not correct")
-                if isinstance(field, tuple):
-                    order_by_fields.extend(field)
+            keys.extend((field, descending) for field in fields)
+        # Uniform direction keeps row-value comparison possible
+        id_descending = bool(keys) and all(descending for _, descending in keys)
+        keys.append((Employee.id, id_descending))
+        return [
+            (key.label(f"sort_key_{i}"), descending)
+            for i, (key, descending) in enumerate(keys)
+        ]
+
+    def _keyset_predicate(self, sort_keys: List[tuple], values: list, backward: bool):
+        """
+        Builds WHERE clause selecting rows after (or before if backward)
+        the row with given sort key values.
+        """
+        keys = [key.element for key, _ in sort_keys]
+        directions = [descending != backward for _, descending in sort_keys]
+        if len(set(directions)) == 1:
+            # (k1, k2, ..., id) > (v1, v2, ..., vid) can use composite indexes
+            left, right = tuple_(*keys), tuple_(*values)
+            return left < right if directions[0] else left > right
+        conditions = []
+        for i, (key, value) in enumerate(zip(keys, values)):
+            step = key < value if directions[i] else key > value
+            equal = [prev == prev_value for prev, prev_value in zip(keys[:i], values)]
+            conditions.append(and_(*equal, step))
+        return or_(*conditions)
+
+    def _encode_cursor(self, values: Sequence) -> str:
+        """Packs sort key values of row into opaque URL-safe string"""
+        data = json.dumps([str(v) if v is not None else None for v in values])
+        return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+    def _decode_cursor(self, cursor: str, sort_keys: List[tuple]) -> list:
+        """Unpacks cursor made by _encode_cursor() for the same sort keys"""
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            data = json.loads(base64.urlsafe_b64decode(padded))
+            if len(data) != len(sort_keys):
+                raise ValueError
+            values = []
+            for (key, _), value in zip(sort_keys, data):
+                python_type = key.type.python_type
+                if python_type is date:
+                    values.append(date.fromisoformat(value))
                 else:
-                    order_by_fields.append(field)
-            stmt = stmt.order_by(*order_by_fields)
-        stmt = stmt.limit(limit=limit)
-        with Session(self.engine) as session:
-            empls = list(session.scalars(stmt))
-        return empls
-
-    def get_hierarchy(self, root_id: int, limit: int = 8) -> dict:
+                    values.append(python_type(value))
+            return values
+        except (ValueError, TypeError, ArithmeticError, NotImplementedError):
+            raise ValueError("Invalid page cursor")
+
+    def get_hierarchy(
+        self,
+        root_id: int,
+        limit: int = 8,
+        max_depth: int | None = None,
+        rollup: bool = False,
+    ) -> dict:
         """
         Returns employee hierarchy as a nested dictionary with element count limitation
 
         Parameters:
             root_id (int): ID of the employee to build hierarchy for
             limit (int): Maximum number of elements to include in hierarchy (default 8)
+            max_depth (int | None): Maximum number of levels below root,
+                unbounded if None
+            rollup (bool): Add "rollup" key with SubtreeRollup of whole
+                subtree (not only displayed part) to every node, see
+                get_rollups()
 
         Returns:
             dict: Nested dictionary structure with format:
@@ -392,111 +2504,90 @@ class EmployeeCatalog:
             }
 
         Implementation Details:
-            - Uses recursive SQL CTE (Common Table Expression) to get reporting chain
-            - Builds hierarchy using BFS (Breadth-First Search) traversal
-            - Limits elements using count-based early termination
+            - Selects subtree by org_path (ltree) in one indexed lookup,
+              no recursive walk over manager_id
+            - Limit and depth are applied in SQL, so only root and first
+              limit subordinates in breadth-first order (depth, then ID)
+              are read and transferred, whatever size of the subtree
+            - Links rows into tree with core.hierarchy.build_tree(): BFS over
+              precomputed manager -> subordinates index, linear in rows
+            - With ORG_INDEX enabled, subtree is taken from org_index and
+              only names and positions of selected employees are read by
+              primary key
             - Explicitly handles SQLAlchemy sessions and connections
             - Works with direct column data instead of ORM relationships
             - Optimized for read-heavy operations with large datasets
 
         Notes:
             1. Root employee is always included even when limit=0
-            2. Subordinates are added in database discovery order
+            2. Subordinates of every employee are ordered by ID
             3. Strictly maintains unique employee IDs in hierarchy
             4. Execution flow:
-                a. Build recursive CTE with position joins
-                b. Execute query and collect raw results
-                c. Convert to dictionary with manager relationships
-                d. Construct tree using BFS with limit check
+                a. Execute prebuilt subtree query (STMT_HIERARCHY) with
+                   root_id bound parameter and collect raw results
+                b. Convert rows to node dictionaries
+                c. Link nodes into tree using BFS with limit check
             5. Returned structure is session-independent
             6. Handles circular references through ID tracking
         """
-        emp = aliased(Employee, name="emp")
-        pos = aliased(Position, name="pos")
-
-        hierarchy = (
-            select(
-                emp.id,
-                emp.manager_id,
-                emp.first_name,
-                emp.last_name,
-                emp.patronymic,
-                pos.title.label("position_title"),
-            )
-            .where(emp.id == root_id)
-            .join(pos, emp.position_id == pos.id)
-            .cte(recursive=True, name="hierarchy")
-        )
-
-        mgr = aliased(Employee, name="mgr")
-        pos_recursive = aliased(Position, name="pos_recursive")
-
-        recursive_part = (
-            select(
-                emp.id,
-                emp.manager_id,
-                emp.first_name,
-                emp.last_name,
-                emp.patronymic,
-                pos_recursive.title.label("position_title"),
-            )
-            .join(mgr, emp.manager_id == mgr.id)
-            .join(hierarchy, mgr.id == hierarchy.c.id)
-            .join(pos_recursive, emp.position_id == pos_recursive.id)
-        )
-
-        cte_query = hierarchy.union_all(recursive_part)
-
-        stmt = select(
-            cte_query.c.id,
-            cte_query.c.manager_id,
-            cte_query.c.first_name,
-            cte_query.c.last_name,
-            cte_query.c.patronymic,
-            cte_query.c.position_title,
-        )
-
-        with Session(self.engine) as session:
-            results = session.execute(stmt).unique().all()
+        index = self.org_index
+        if index is not None:
+            results = self._indexed_hierarchy_rows(index, root_id, limit, max_depth)
+        else:
+            with Session(self.engine) as session:
+                results = session.execute(
+                    STMT_HIERARCHY,
+                    {"root_id": root_id, "limit": limit + 1, "max_depth": max_depth},
+                ).all()
 
-        # Собираем словарь сотрудников
-        employees_dict = {
-            row.id: {
+        # Собираем узлы дерева и связываем их за линейное время
+        nodes = [
+            {
                 "id": row.id,
                 "manager_id": row.manager_id,
-                "full_name": f"{row.last_name} {row.first_name} {row.patronymic or ''}".strip(),
+                "full_name": format_full_name(
+                    row.last_name, row.first_name, row.patronymic
+                ),
                 "position": row.position_title,
                 "subordinates": [],
             }
             for row in results
-        }
-
-        # BFS
-        root = employees_dict.get(root_id)
-        if not root:
-            return {}
-
-        queue = [root]
-        count = 0
-        added_ids = {root_id}
-
-        while queue and count < limit:
-            current = queue.pop(0)
-            subordinates = [
-                emp
-                for emp in employees_dict.values()
-                if emp["manager_id"] == current["id"] and emp["id"] not in added_ids
-            ]
-
-            for emp in subordinates:
-                if count >= limit:
-                    break
-                current["subordinates"].append(emp)
-                added_ids.add(emp["id"])
-                queue.append(emp)
-                count += 1
-
-        return root
+        ]
+        if rollup and nodes:
+            rollups = self.get_rollups(
+                root_id=root_id, ids=[node["id"] for node in nodes]
+            )
+            for node in nodes:
+                node["rollup"] = rollups.get(node["id"])
+        return build_tree(nodes, root_id=root_id, limit=limit)
+
+    def _indexed_hierarchy_rows(
+        self, index: OrgIndex, root_id: int, limit: int, max_depth: int | None
+    ) -> list:
+        """Rows of STMT_HIERARCHY shape for subtree selected by org index"""
+        subtree = index.subtree(root_id, limit=limit, max_depth=max_depth)
+        if not subtree:
+            return []
+        with self.engine.connect() as conn:
+            labels = {
+                row.id: row
+                for row in conn.execute(
+                    STMT_EMPLOYEE_LABELS, {"ids": [id for id, _ in subtree]}
+                )
+            }
+        return [
+            SimpleNamespace(
+                id=id,
+                manager_id=index.manager(id),
+                first_name=labels[id].first_name,
+                last_name=labels[id].last_name,
+                patronymic=labels[id].patronymic,
+                position_title=labels[id].position_title,
+                depth=depth,
+            )
+            for id, depth in subtree
+            if id in labels
+        ]
 
     def get_position_id(self, position_title: str) -> int:
         """
@@ -506,7 +2597,7 @@ class EmployeeCatalog:
         :return: ID of the position
         """
         with Session(self.engine) as session:
-            pos = session.scalar(select(Position.id).where(Position.title == position_title))
+            pos = session.scalar(STMT_POSITION_BY_TITLE, {"title": position_title})
         if not pos:
             raise ValueError(f"Position with title '{position_title}' not found")
         return pos
@@ -561,32 +2652,30 @@ class EmployeeCatalog:
             - Maintains data consistency through transaction blocks
         """
         data = {}
-        gender = random.choice([Gender.MALE, Gender.FEMALE])
+        gender = self.generator.gender()
         data['first_name'] = emp_data.get('first_name', self.person.first_name(gender=gender))
         data['last_name'] = emp_data.get('last_name', self.person.last_name(gender=gender))
         if settings.LANGUAGE == 'ru':
-            rsp = RussiaSpecProvider()
-            data['patronymic'] = emp_data.get('patronymic', rsp.patronymic(gender=gender))
+            data['patronymic'] = emp_data.get('patronymic', self.generator.patronymic(gender))
         elif emp_data.get('patronymic'):
             data["patronymic"] = emp_data['patronymic']
         data['hire_date'] = emp_data.get('hire_date', self.datetime.date(start=2015, end=2024))
         data['salary'] = emp_data.get('salary', self.finance.price(minimum=30000, maximum=300000))
         if not emp_data.get('position_id'):
             with Session(self.engine) as session:
-                positions = list(session.scalars(select(Position.id)))
+                positions = list(session.scalars(STMT_POSITION_IDS))
             data['position_id'] = random.choice(positions)
         else:
             data['position_id'] = emp_data.get('position_id')
         if not emp_data.get('manager_id'):
             with Session(self.engine) as session:
-                level = session.scalar(select(Position.level).where(Position.id == data["position_id"]))
+                level = session.scalar(
+                    STMT_POSITION_LEVEL, {"position_id": data["position_id"]}
+                )
                 if level != 1:
-                    stmt = (
-                        select(Employee.id)
-                        .join(Position)
-                        .where(Position.level == level - 1)
+                    manager_ids = list(
+                        session.scalars(STMT_EMPLOYEE_IDS_BY_LEVEL, {"level": level - 1})
                     )
-                    manager_ids = list(session.scalars(stmt))
                     data['manager_id'] = random.choice(manager_ids)
         else:
             data['manager_id'] = emp_data.get('manager_id')
@@ -594,7 +2683,14 @@ class EmployeeCatalog:
         with Session(self.engine) as session:
             session.add(new_employee)
             session.commit()
+            self.cache.clear()
             session.refresh(new_employee)
+            if self._org_index is not None:
+                self._org_index.add(
+                    new_employee.id,
+                    new_employee.manager_id,
+                    new_employee.position.level,
+                )
         return new_employee
 
     def update_employee(self, id: int, emp_data: dict) -> Employee:
@@ -639,10 +2735,9 @@ class EmployeeCatalog:
                     employee.manager_id = None
                 elif new_position.level != employee.position.level:
                     # Auto-assign manager for new level
-                    stmt = select(Employee.id).join(Position).where(
-                        Position.level == new_position.level - 1
-                    )
-                    managers = session.scalars(stmt).all()
+                    managers = session.scalars(
+                        STMT_EMPLOYEE_IDS_BY_LEVEL, {"level": new_position.level - 1}
+                    ).all()
                     if not managers:
                         raise ValueError("No available managers for this position level")
                     employee.manager_id = random.choice(managers)
@@ -664,7 +2759,12 @@ class EmployeeCatalog:
                 raise ValueError("Non-top level employees must have a manager")
 
             session.commit()
+            self.cache.clear()
             session.refresh(employee)
+            if self._org_index is not None:
+                self._org_index.move(
+                    employee.id, employee.manager_id, employee.position.level
+                )
             return employee
 
     def delete_employee(self, id: int):
@@ -672,6 +2772,147 @@ class EmployeeCatalog:
             employee = session.get(Employee, id)
             session.delete(employee)
             session.commit()
+        self.cache.clear()
+        if self._org_index is not None:
+            self._org_index.remove(id)
+
+    def export_employees(
+        self, file: TextIO, fmt: str = "csv", batch_size: int = 10000
+    ) -> int:
+        """
+        Streams all employees into file as CSV or JSON Lines.
+
+        :param file: Text file opened for writing
+        :type file: TextIO
+        :param fmt: "csv" or "jsonl"
+        :type fmt: str
+        :param batch_size: Rows fetched from server-side cursor at once
+        :type batch_size: int
+
+        :return: Number of exported employees
+        :rtype: int
+
+        Features:
+            - Constant memory: rows are fetched with yield_per from
+              server-side cursor and written immediately
+            - Position is exported by title, manager by ID, so output can
+              be loaded back with import_employees()
+            - Rows are ordered by ID
+        """
+        if fmt not in EXCHANGE_FORMATS:
+            raise ValueError(f"Unknown file format: {fmt}")
+        stmt = (
+            select(
+                Employee.id,
+                Employee.last_name,
+                Employee.first_name,
+                Employee.patronymic,
+                Position.title.label("position"),
+                Employee.hire_date,
+                Employee.salary,
+                Employee.manager_id,
+            )
+            .join(Position, Employee.position_id == Position.id)
+            .order_by(Employee.id)
+            .execution_options(yield_per=batch_size)
+        )
+        count = 0
+        if fmt == "csv":
+            writer = csv.writer(file)
+            writer.writerow(EXCHANGE_COLUMNS)
+        with Session(self.engine) as session:
+            for row in session.execute(stmt):
+                if fmt == "csv":
+                    writer.writerow(row)
+                else:
+                    item = json.dumps(row._asdict(), ensure_ascii=False, default=str)
+                    file.write(item + "\n")
+                count += 1
+        return count
+
+    def import_employees(self, file: TextIO, fmt: str = "csv") -> int:
+        """
+        Loads employees from CSV or JSON Lines file in one transaction.
+
+        :param file: Text file opened for reading. CSV must have header with
+                     columns of EXCHANGE_COLUMNS; id, patronymic and
+                     manager_id may be omitted.
+        :type file: TextIO
+        :param fmt: "csv" or "jsonl"
+        :type fmt: str
+
+        :return: Number of imported employees
+        :rtype: int
+
+        :raises ValueError: For unknown columns or rows breaking hierarchy
+                            rules; nothing is imported in this case. Rows
+                            are referred to by record number, the first
+                            record after CSV header being 1
+
+        Process flow:
+            1. Streams file into temporary staging table with COPY
+            2. Assigns IDs from sequence to rows without id
+            3. Validates all rows with one set-based query: hire dates
+               (YYYY-MM-DD, not in future), positive salaries, position
+               titles, CEO without manager, existing manager with higher
+               position (in database or in the same file), unique IDs
+            4. Moves rows into employees resolving position titles to IDs
+               in the same statement, ordered by hierarchy level
+
+        Notes:
+            Rows do not pass through ORM, so the per-object before_flush
+            validation is replaced by step 3.
+        """
+        if fmt not in EXCHANGE_FORMATS:
+            raise ValueError(f"Unknown file format: {fmt}")
+        if fmt == "csv":
+            columns = next(csv.reader([file.readline()]))
+        else:
+            columns = EXCHANGE_COLUMNS
+        unknown = set(columns) - set(EXCHANGE_COLUMNS)
+        if unknown or not columns:
+            raise ValueError(
+                messages["errors"]["cli"]["options"].format(opt=", ".join(unknown))
+            )
+        sql = f"COPY employees_import ({', '.join(columns)}) FROM STDIN"
+        with self.engine.begin() as conn:
+            conn.execute(SQL_CREATE_IMPORT_TABLE)
+            with conn.connection.driver_connection.cursor() as cursor:
+                if fmt == "csv":
+                    with cursor.copy(f"{sql} WITH (FORMAT csv)") as copy:
+                        while block := file.read(1 << 16):
+                            copy.write(block)
+                else:
+                    with cursor.copy(sql) as copy:
+                        for line in file:
+                            if line.strip():
+                                item = json.loads(line)
+                                copy.write_row([item.get(c) for c in columns])
+            conn.execute(SQL_FILL_IMPORT_IDS)
+            errors = conn.execute(SQL_VALIDATE_IMPORT).all()
+            if errors:
+                msgs = messages["errors"]["import"]
+                raise ValueError(
+                    "\n".join(
+                        msgs["record"].format(record=row.record_no)
+                        + msgs[row.error].format(**row._asdict())
+                        for row in errors
+                    )
+                )
+            count = conn.execute(SQL_INSERT_IMPORT).rowcount
+            conn.execute(
+                select(
+                    func.setval(
+                        func.pg_get_serial_sequence(Employee.__tablename__, "id"),
+                        select(func.coalesce(func.max(Employee.id), 0) + 1)
+                        .scalar_subquery(),
+                        False,
+                    )
+                )
+            )
+        self.cache.clear()
+        self._org_index = None
+        return count
 
 
 employee_catalog = EmployeeCatalog()
@@ -0,0 +1,303 @@
+import random
+import numpy as np
+from collections import deque
+from concurrent.futures import Executor
+from datetime import date
+from functools import lru_cache
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Sequence
+from core.settings import settings
+from mimesis import Person, Datetime, Finance
+from mimesis.locales import Locale
+from mimesis.enums import Gender
+from mimesis.builtins.ru import RussiaSpecProvider
+
+
+lang_dict = {
+    "ru": Locale.RU,
+    "en": Locale.EN,
+}
+
+
+class EmployeeGenerator:
+    """Random employee data built on its own (optionally seeded) providers"""
+
+    def __init__(self, language: str = settings.LANGUAGE, seed=None):
+        self.language = language
+        self.random = random.Random(seed)
+        provider_seed = None if seed is None else self.random.getrandbits(64)
+        self.person = Person(lang_dict[language], seed=provider_seed)
+        self.datetime = Datetime(seed=provider_seed)
+        self.finance = Finance(seed=provider_seed)
+        self.rsp = RussiaSpecProvider(seed=provider_seed) if language == "ru" else None
+
+    def gender(self) -> Gender:
+        return self.random.choice([Gender.MALE, Gender.FEMALE])
+
+    def patronymic(self, gender: Gender) -> str | None:
+        """Returns patronymic for Russian locale, None for others"""
+        if self.rsp is None:
+            return None
+        return self.rsp.patronymic(gender=gender)
+
+    def employee_data(self) -> dict:
+        """Generates name, hire date and salary fields of employee"""
+        data = {}
+        gender = self.gender()
+        data["first_name"] = self.person.first_name(gender=gender)
+        data["last_name"] = self.person.last_name(gender=gender)
+        if self.rsp is not None:
+            data["patronymic"] = self.patronymic(gender)
+        data["hire_date"] = self.datetime.date(start=2015, end=2024)
+        data["salary"] = self.finance.price(minimum=30000, maximum=300000)
+        return data
+
+    def employee_row(
+        self, id: int, position_id: int | None, manager_id: int | None
+    ) -> tuple:
+        """Returns employee as tuple in EMPLOYEE_COPY_COLUMNS order"""
+        data = self.employee_data()
+        return (
+            id,
+            data["first_name"],
+            data["last_name"],
+            data.get("patronymic"),
+            position_id,
+            data["hire_date"],
+            data["salary"],
+            manager_id,
+        )
+
+
+class GenerationTask(NamedTuple):
+    """Chunk of one hierarchy level to be generated by a worker"""
+
+    seed: int
+    ids: range
+    position_ids: Sequence[int]
+    manager_ids: Sequence[int] | None
+    language: str = settings.LANGUAGE
+
+
+def generate_employee_rows(task: GenerationTask) -> List[tuple]:
+    """
+    Generates rows for one chunk of employees.
+
+    Module-level function so it can be sent to a process pool. Providers are
+    seeded from (task.seed, first ID of chunk), so every chunk gets its own
+    independent stream and the result does not depend on worker count.
+    """
+    generator = EmployeeGenerator(
+        language=task.language, seed=f"{task.seed}:{task.ids.start}"
+    )
+    choice = generator.random.choice
+    return [
+        generator.employee_row(
+            id=id,
+            position_id=choice(task.position_ids),
+            manager_id=(
+                int(choice(task.manager_ids))
+                if task.manager_ids is not None
+                else None
+            ),
+        )
+        for id in task.ids
+    ]
+
+
+def split_tasks(
+    seed: int,
+    ids: range,
+    position_ids: Sequence[int],
+    manager_ids: Sequence[int] | None,
+    chunk_size: int = settings.GENERATION_CHUNK_SIZE,
+) -> Iterator[GenerationTask]:
+    """Lazily shards reserved IDs of a level into chunk-sized generation tasks"""
+    position_ids = tuple(position_ids)
+    for start in range(0, len(ids), chunk_size):
+        yield GenerationTask(
+            seed=seed,
+            ids=ids[start : start + chunk_size],
+            position_ids=position_ids,
+            manager_ids=manager_ids,
+        )
+
+
+def bounded_map(
+    executor: Executor, fn: Callable, tasks: Iterable, window: int
+) -> Iterator:
+    """
+    Like executor.map(), but keeps at most window tasks submitted.
+
+    Executor.map() submits every task upfront, so results pile up in memory
+    when the consumer is slower than the workers. Results are yielded in
+    order of tasks.
+    """
+    pending = deque()
+    for task in tasks:
+        pending.append(executor.submit(fn, task))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+HIRE_DATE_START = np.datetime64(date(2015, 1, 1), "D")
+HIRE_DATE_END = np.datetime64(date(2024, 12, 31), "D")
+NAME_POOL_DRAWS = 5000
+
+
+class NamePools(NamedTuple):
+    """Unique names of one locale, indexed by gender (0 - male, 1 - female)"""
+
+    first_names: tuple
+    last_names: tuple
+    patronymics: tuple | None
+
+
+@lru_cache(maxsize=8)
+def build_name_pools(language: str, seed: int | None = None) -> NamePools:
+    """
+    Collects name pools of locale once per process.
+
+    Names are drawn from mimesis NAME_POOL_DRAWS times per gender and
+    deduplicated, which covers the provider datasets almost entirely.
+    """
+    generator = EmployeeGenerator(language=language, seed=seed)
+    first_names, last_names, patronymics = [], [], []
+    for gender in (Gender.MALE, Gender.FEMALE):
+        draws = range(NAME_POOL_DRAWS)
+        first_names.append(
+            np.unique([generator.person.first_name(gender=gender) for _ in draws])
+        )
+        last_names.append(
+            np.unique([generator.person.last_name(gender=gender) for _ in draws])
+        )
+        if generator.rsp is not None:
+            patronymics.append(
+                np.unique([generator.patronymic(gender) for _ in draws])
+            )
+    return NamePools(
+        first_names=tuple(first_names),
+        last_names=tuple(last_names),
+        patronymics=tuple(patronymics) if patronymics else None,
+    )
+
+
+class ColumnBatch(NamedTuple):
+    """Columnar chunk of employees, one array per EMPLOYEE_COPY_COLUMNS item"""
+
+    id: np.ndarray
+    first_name: np.ndarray
+    last_name: np.ndarray
+    patronymic: np.ndarray | None
+    position_id: np.ndarray
+    hire_date: np.ndarray
+    salary: np.ndarray
+    manager_id: np.ndarray | None
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[tuple]) -> "ColumnBatch":
+        """Builds batch from rows in EMPLOYEE_COPY_COLUMNS order"""
+        (
+            ids,
+            first_names,
+            last_names,
+            patronymics,
+            position_ids,
+            hire_dates,
+            salaries,
+            manager_ids,
+        ) = zip(*rows)
+        return cls(
+            id=np.array(ids, dtype=np.int64),
+            first_name=np.array(first_names, dtype=str),
+            last_name=np.array(last_names, dtype=str),
+            patronymic=(
+                np.array(patronymics, dtype=str) if patronymics[0] is not None else None
+            ),
+            position_id=np.array(position_ids, dtype=np.int64),
+            hire_date=np.array(hire_dates, dtype="datetime64[D]"),
+            salary=np.array(salaries, dtype=np.float64),
+            manager_id=(
+                np.array(manager_ids, dtype=np.int64)
+                if manager_ids[0] is not None
+                else None
+            ),
+        )
+
+    def to_copy_text(self) -> str:
+        """
+        Formats batch in COPY text format.
+
+        Columns are converted to strings with numpy and joined with C-level
+        map/zip, no Python code runs per row. Generated values never contain
+        tabs, newlines or backslashes, so no escaping is needed.
+        """
+        size = len(self.id)
+        null = np.full(size, "\\N")
+        columns = [
+            self.id.astype(str),
+            self.first_name,
+            self.last_name,
+            null if self.patronymic is None else self.patronymic,
+            self.position_id.astype(str),
+            self.hire_date.astype(str),
+            self.salary.astype(str),
+            null if self.manager_id is None else self.manager_id.astype(str),
+        ]
+        lines = map("\t".join, zip(*(column.tolist() for column in columns)))
+        return "\n".join(lines) + "\n" if size else ""
+
+
+def _draw(rng: np.random.Generator, ids: Sequence[int], size: int) -> np.ndarray:
+    """Draws size random items of ids, without materializing ranges"""
+    if isinstance(ids, range) and ids.step == 1:
+        return rng.integers(ids.start, ids.stop, size=size)
+    return rng.choice(np.asarray(ids), size=size)
+
+
+def generate_employee_batch(task: GenerationTask) -> ColumnBatch:
+    """
+    Vectorized counterpart of generate_employee_rows().
+
+    Draws whole columns at once: names by index arrays over prebuilt pools,
+    hire dates as day offsets, salaries as rounded floats and managers over
+    the previous level's IDs.
+    """
+    pools = build_name_pools(task.language, task.seed)
+    rng = np.random.default_rng([task.seed, task.ids.start])
+    size = len(task.ids)
+    genders = rng.integers(0, 2, size=size)
+
+    def pick(pool: tuple) -> np.ndarray:
+        result = np.empty(size, dtype=object)
+        for gender, names in enumerate(pool):
+            mask = genders == gender
+            result[mask] = names[rng.integers(0, len(names), size=mask.sum())]
+        return result
+
+    span = int((HIRE_DATE_END - HIRE_DATE_START).astype(int)) + 1
+    return ColumnBatch(
+        id=np.arange(task.ids.start, task.ids.stop, dtype=np.int64),
+        first_name=pick(pools.first_names),
+        last_name=pick(pools.last_names),
+        patronymic=pick(pools.patronymics) if pools.patronymics else None,
+        position_id=_draw(rng, task.position_ids, size),
+        hire_date=HIRE_DATE_START + rng.integers(0, span, size=size),
+        salary=np.round(rng.uniform(30000, 300000, size=size), 2),
+        manager_id=(
+            _draw(rng, task.manager_ids, size)
+            if task.manager_ids is not None
+            else None
+        ),
+    )
+
+
+# Chunk generators by name of generation engine
+GENERATION_ENGINES = {
+    "mimesis": generate_employee_rows,
+    "numpy": generate_employee_batch,
+}
@@ -0,0 +1,62 @@
+from collections import defaultdict, deque
+from operator import itemgetter
+from typing import Dict, Iterable, List
+
+
+def children_index(
+    nodes: Iterable[dict],
+) -> tuple[Dict[int, dict], Dict[int, List[dict]]]:
+    """
+    Indexes flat nodes with "id" and "manager_id" keys in one pass.
+
+    :return: (node by ID, direct subordinates by manager ID)
+    """
+    by_id = {}
+    children = defaultdict(list)
+    for node in nodes:
+        by_id[node["id"]] = node
+        children[node["manager_id"]].append(node)
+    return by_id, children
+
+
+def build_tree(nodes: Iterable[dict], root_id: int, limit: int) -> dict:
+    """
+    Links flat nodes into tree under root_id, keeping at most limit nodes
+    besides root.
+
+    :param nodes: Dicts with "id", "manager_id" and empty "subordinates"
+                  list, which is filled in place
+    :param root_id: ID of root node
+    :param limit: Maximum number of subordinates of all levels
+
+    :return: Root node, or empty dict if there is no node with root_id
+
+    Nodes are taken breadth-first, subordinates of a node ordered by ID, so
+    the result depends only on the set of nodes. Runs in O(n + k log k):
+    one pass to build children index and one visit per kept node, sorting
+    only children lists of visited nodes. IDs already in tree are skipped,
+    so duplicated rows and cycles cannot loop.
+    """
+    by_id, children = children_index(nodes)
+    root = by_id.get(root_id)
+    if root is None:
+        return {}
+
+    queue = deque([root])
+    added_ids = {root_id}
+    count = 0
+    by_node_id = itemgetter("id")
+
+    while queue and count < limit:
+        current = queue.popleft()
+        for node in sorted(children.get(current["id"], ()), key=by_node_id):
+            if count >= limit:
+                break
+            if node["id"] in added_ids:
+                continue
+            current["subordinates"].append(node)
+            added_ids.add(node["id"])
+            queue.append(node)
+            count += 1
+
+    return root
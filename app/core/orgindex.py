@@ -0,0 +1,212 @@
+import numpy as np
+from collections import defaultdict
+from typing import Iterable, List
+
+
+class OrgIndex:
+    """
+    In-memory org chart: manager and position level by employee ID plus
+    subordinates in CSR layout, about 13 bytes per employee.
+
+    :param ids: Employee IDs
+    :param manager_ids: Manager ID of every employee, -1 for none
+    :param levels: Position level of every employee (1 - CEO)
+
+    Arrays are indexed by employee ID directly:
+        parent[id]    - manager ID or -1
+        level[id]     - position level, 0 if there is no such employee
+        children[offsets[id]:offsets[id + 1]] - subordinates ordered by ID
+
+    add(), move() and remove() patch parent and level in place. Children
+    lists are not rewritten: stale CSR entries are skipped by checking
+    parent[child], new ones are kept in a small overlay until
+    REBUILD_THRESHOLD patches accumulate and CSR is rebuilt.
+    """
+
+    REBUILD_THRESHOLD = 4096
+
+    def __init__(
+        self, ids: np.ndarray, manager_ids: np.ndarray, levels: np.ndarray
+    ):
+        size = int(ids.max()) + 1 if len(ids) else 1
+        self.parent = np.full(size, -1, dtype=np.int32)
+        self.level = np.zeros(size, dtype=np.int8)
+        self.parent[ids] = manager_ids
+        self.level[ids] = levels
+        self._rebuild()
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple]) -> "OrgIndex":
+        """Builds index from (id, manager_id or None, level) rows"""
+        data = np.array(
+            [
+                (id, -1 if manager_id is None else manager_id, level)
+                for id, manager_id, level in rows
+            ],
+            dtype=np.int64,
+        ).reshape(-1, 3)
+        return cls(ids=data[:, 0], manager_ids=data[:, 1], levels=data[:, 2])
+
+    def _rebuild(self):
+        """Rebuilds CSR children arrays from parent array"""
+        ids = np.flatnonzero(self.level)
+        parents = self.parent[ids]
+        has_parent = parents >= 0
+        ids, parents = ids[has_parent], parents[has_parent]
+        # Stable sort keeps ID order of subordinates of every manager
+        order = np.argsort(parents, kind="stable")
+        self.children = ids[order].astype(np.int32)
+        counts = np.bincount(parents, minlength=len(self.parent))
+        self.offsets = np.zeros(len(self.parent) + 1, dtype=np.int32)
+        np.cumsum(counts, out=self.offsets[1:])
+        self._added = defaultdict(list)
+        self._patches = 0
+
+    def __contains__(self, id: int) -> bool:
+        return 0 <= id < len(self.level) and self.level[id] != 0
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.level))
+
+    def _grow(self, id: int):
+        size = len(self.parent)
+        if id < size:
+            return
+        new_size = max(id + 1, size * 2)
+        self.parent = np.concatenate(
+            [self.parent, np.full(new_size - size, -1, dtype=np.int32)]
+        )
+        self.level = np.concatenate(
+            [self.level, np.zeros(new_size - size, dtype=np.int8)]
+        )
+
+    def _patched(self):
+        self._patches += 1
+        if self._patches >= self.REBUILD_THRESHOLD:
+            self._rebuild()
+
+    def add(self, id: int, manager_id: int | None, level: int):
+        """Registers new employee"""
+        self._grow(id)
+        self.parent[id] = -1 if manager_id is None else manager_id
+        self.level[id] = level
+        if manager_id is not None:
+            self._added[manager_id].append(id)
+        self._patched()
+
+    def move(self, id: int, manager_id: int | None, level: int):
+        """Updates manager and level of existing employee"""
+        if self.parent[id] == (-1 if manager_id is None else manager_id):
+            self.level[id] = level
+            return
+        self.add(id, manager_id, level)
+
+    def remove(self, id: int):
+        """Unregisters deleted employee"""
+        if id in self:
+            self.parent[id] = -1
+            self.level[id] = 0
+            self._patched()
+
+    def manager(self, id: int) -> int | None:
+        if id not in self:
+            return None
+        manager_id = int(self.parent[id])
+        return None if manager_id < 0 else manager_id
+
+    def subordinates(self, id: int) -> List[int]:
+        """Direct subordinates of employee ordered by ID"""
+        result = []
+        if id + 1 < len(self.offsets):
+            csr = self.children[self.offsets[id] : self.offsets[id + 1]]
+            result = csr[self.parent[csr] == id].tolist()
+        added = self._added.get(id)
+        if added:
+            result = sorted(
+                set(result).union(
+                    child for child in added if self.parent[child] == id
+                )
+            )
+        return result
+
+    def ancestors(self, id: int) -> List[int]:
+        """Managers of employee from direct one up to CEO"""
+        if id not in self:
+            return []
+        chain = []
+        manager_id = self.parent[id]
+        while manager_id >= 0 and len(chain) < len(self.parent):
+            chain.append(int(manager_id))
+            manager_id = self.parent[manager_id]
+        return chain
+
+    def depth(self, id: int) -> int:
+        """Number of managers above employee"""
+        return len(self.ancestors(id))
+
+    def subtree(
+        self, id: int, limit: int | None = None, max_depth: int | None = None
+    ) -> List[tuple]:
+        """
+        (id, depth) of employee and its subordinates level by level, every
+        level ordered by ID, as STMT_HIERARCHY orders by (depth, id). At
+        most limit subordinates and max_depth levels below employee are
+        returned.
+        """
+        if id not in self:
+            return []
+        size = len(self.parent) if limit is None else limit + 1
+        result = [(id, 0)]
+        frontier = np.array([id], dtype=np.int64)
+        depth = 0
+        # Bounded by number of levels, guards against inconsistent input
+        while len(result) < size and depth < len(self.parent):
+            if max_depth is not None and depth >= max_depth:
+                break
+            frontier = np.sort(self._subordinates_of_many(frontier))
+            if not len(frontier):
+                break
+            depth += 1
+            result.extend(
+                (int(child), depth) for child in frontier[: size - len(result)]
+            )
+        return result
+
+    def _subordinates_of_many(self, ids: np.ndarray) -> np.ndarray:
+        """Direct subordinates of all ids at once, vectorized over CSR"""
+        indexed = ids[ids + 1 < len(self.offsets)]
+        starts = self.offsets[indexed].astype(np.int64)
+        lengths = self.offsets[indexed + 1] - starts
+        total = int(lengths.sum())
+        positions = (
+            np.arange(total)
+            - np.repeat(np.cumsum(lengths) - lengths, lengths)
+            + np.repeat(starts, lengths)
+        )
+        children = self.children[positions]
+        children = children[self.parent[children] == np.repeat(indexed, lengths)]
+        if self._added:
+            managers = np.fromiter(self._added, dtype=np.int64)
+            extra = [
+                child
+                for manager_id in managers[np.isin(managers, ids)]
+                for child in self._added[manager_id]
+                if self.parent[child] == manager_id
+            ]
+            if extra:
+                children = np.unique(np.concatenate([children, extra]))
+        return children
+
+    def subtree_size(self, id: int) -> int:
+        """Number of direct and indirect subordinates of employee"""
+        if id not in self:
+            return 0
+        frontier = np.array([id], dtype=np.int64)
+        total = 0
+        # Bounded by number of levels, guards against inconsistent input
+        for _ in range(len(self.parent)):
+            frontier = self._subordinates_of_many(frontier)
+            if not len(frontier):
+                break
+            total += len(frontier)
+        return total
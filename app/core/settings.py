@@ -1,4 +1,5 @@
 import os
+from pathlib import Path
 from dotenv import load_dotenv
 
 
@@ -15,9 +16,31 @@ class Settings:
     DB_NAME = os.getenv('DB_NAME', 'employee_catalog')
 
     DATABASE_URL = f"postgresql+psycopg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+    # Число выполнений запроса на соединении, после которого psycopg
+    # подготавливает его на сервере: 0 - сразу, none - никогда
+    DB_PREPARE_THRESHOLD = os.getenv('DB_PREPARE_THRESHOLD', '2')
+    DB_PREPARE_THRESHOLD = (
+        None if DB_PREPARE_THRESHOLD.lower() == 'none' else int(DB_PREPARE_THRESHOLD)
+    )
 
     LANGUAGE = os.getenv('LANGUAGE', 'ru')
     INITIAL_DATA_COUNT = int(os.getenv('INITIAL_DATA_COUNT', 50000))
 
+    # Настройки генерации данных
+    GENERATION_WORKERS = int(os.getenv('GENERATION_WORKERS', os.cpu_count() or 1))
+    GENERATION_CHUNK_SIZE = int(os.getenv('GENERATION_CHUNK_SIZE', 10000))
+    GENERATION_ENGINE = os.getenv('GENERATION_ENGINE', 'mimesis')  # mimesis/numpy/sql
+    SNAPSHOT_DIR = os.getenv(
+        'SNAPSHOT_DIR', str(Path(__file__).parent.parent.parent / 'snapshots')
+    )
+
+    # Кэш выборок списка сотрудников
+    LIST_CACHE_SIZE = int(os.getenv('LIST_CACHE_SIZE', 128))
+    LIST_CACHE_TTL = float(os.getenv('LIST_CACHE_TTL', 60))
+    # Оценка числа найденных сотрудников ниже порога уточняется точным COUNT
+    COUNT_EXACT_THRESHOLD = int(os.getenv('COUNT_EXACT_THRESHOLD', 10000))
+    # Держать структуру оргдерева в памяти процесса для запросов tree
+    ORG_INDEX = os.getenv('ORG_INDEX', 'false').lower() in ('1', 'true', 'yes')
+
 
 settings = Settings()
\ No newline at end of file
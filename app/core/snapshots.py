@@ -0,0 +1,82 @@
+import zipfile
+import numpy as np
+from pathlib import Path
+from typing import Iterator
+from core.generators import ColumnBatch
+from core.settings import settings
+
+
+def snapshot_path(
+    seed: int,
+    rows: int,
+    language: str = settings.LANGUAGE,
+    engine: str = settings.GENERATION_ENGINE,
+    chunk_size: int = settings.GENERATION_CHUNK_SIZE,
+) -> Path:
+    """
+    Returns path of dataset snapshot.
+
+    Besides seed, rows and locale the key contains engine and chunk size,
+    because chunks are seeded separately and both change generated values.
+    """
+    name = f"employees_{language}_{engine}_{rows}_{chunk_size}_{seed}.npz"
+    return Path(settings.SNAPSHOT_DIR) / name
+
+
+class SnapshotWriter:
+    """
+    Writes ColumnBatch chunks into .npz archive one by one.
+
+    Every chunk is stored as separate "<chunk>_<column>.npy" members, so
+    neither writing nor reading needs the whole dataset in memory. Archive
+    is written to temporary file and renamed on success, so interrupted
+    generation never leaves a snapshot that looks complete.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.tmp_path = self.path.with_suffix(".tmp")
+        self.chunks = 0
+        self.zip = None
+
+    def __enter__(self) -> "SnapshotWriter":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.zip = zipfile.ZipFile(
+            self.tmp_path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1
+        )
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.zip.close()
+        if exc_type is None:
+            self.tmp_path.replace(self.path)
+        else:
+            self.tmp_path.unlink(missing_ok=True)
+
+    def write(self, batch: ColumnBatch):
+        for column, values in batch._asdict().items():
+            if values is None:
+                continue
+            if values.dtype == object:
+                values = values.astype(str)
+            name = f"{self.chunks:06d}_{column}.npy"
+            with self.zip.open(name, "w", force_zip64=True) as f:
+                np.lib.format.write_array(f, values, allow_pickle=False)
+        self.chunks += 1
+
+
+def read_snapshot(path: Path) -> Iterator[ColumnBatch]:
+    """Lazily yields ColumnBatch chunks of snapshot in written order"""
+    with np.load(path, allow_pickle=False) as data:
+        chunks = sorted({name.split("_", 1)[0] for name in data.files})
+        for chunk in chunks:
+            yield ColumnBatch(
+                **{
+                    column: (
+                        data[f"{chunk}_{column}"]
+                        if f"{chunk}_{column}" in data.files
+                        else None
+                    )
+                    for column in ColumnBatch._fields
+                }
+            )
@@ -7,7 +7,11 @@ from sqlalchemy import (
     String,
     Date,
     Numeric,
+    literal_column,
+    select,
 )
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.types import UserDefinedType
 from sqlalchemy.orm import Mapped, mapped_column, relationship, DeclarativeBase, Session
 from core.cli.localization import messages
 
@@ -31,6 +35,15 @@ class Base(DeclarativeBase):
     pass
 
 
+class Ltree(UserDefinedType):
+    """PostgreSQL label path type, requires ltree extension"""
+
+    cache_ok = True
+
+    def get_col_spec(self, **kw):
+        return "ltree"
+
+
 class Position(Base):
     __tablename__ = "positions"
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -54,6 +67,10 @@ class Employee(Base):
     hire_date: Mapped[str] = mapped_column(Date, nullable=False)
     salary: Mapped[float] = mapped_column(Numeric(10, 2), nullable=False)
     manager_id: Mapped[int] = mapped_column(ForeignKey("employees.id"), nullable=True)
+    # Name parts and position title, maintained by trigger (see init_tables())
+    search_vector: Mapped[str] = mapped_column(TSVECTOR, nullable=True, deferred=True)
+    # IDs from CEO down to employee, e.g. "1.5.42", maintained by trigger
+    org_path: Mapped[str] = mapped_column(Ltree, nullable=False, deferred=True)
 
     position: Mapped["Position"] = relationship(back_populates="employees")
     manager = relationship("Employee", remote_side=[id], foreign_keys=[manager_id])
@@ -66,6 +83,13 @@ class Employee(Base):
     def manager_position_level(self):
         return self.manager.position.level if self.manager else None
 
+    @property
+    def position_title(self):
+        return self.position.title
+
+    def get_manager_name(self) -> str:
+        return self.manager.get_full_name() if self.manager else ""
+
     __table_args__ = (
         CheckConstraint("hire_date <= CURRENT_DATE", name="valid_hire_date"),
         CheckConstraint("manager_id != id", name="valid_manager"),
@@ -76,12 +100,13 @@ class Employee(Base):
         Index("idx_emp_hire_date", hire_date),
         Index("idx_emp_salary", salary),
         Index("idx_emp_name_lower", func.lower(last_name), func.lower(first_name)),
+        Index("idx_emp_search", search_vector, postgresql_using="gin"),
+        Index("idx_emp_org_path", org_path, postgresql_using="gist"),
+        Index("idx_emp_org_depth", func.nlevel(org_path), id),
     )
 
     def get_full_name(self) -> str:
-        if self.patronymic:
-            return f"{self.last_name} {self.first_name} {self.patronymic}"
-        return f"{self.last_name} {self.first_name}"
+        return format_full_name(self.last_name, self.first_name, self.patronymic)
 
     def get_short_name(self) -> str:
         if self.patronymic:
@@ -92,48 +117,110 @@ class Employee(Base):
         return f"<Employee id={self.id!r} name={self.get_full_name()}"
 
 
+def format_full_name(last_name: str, first_name: str, patronymic: str | None) -> str:
+    if patronymic:
+        return f"{last_name} {first_name} {patronymic}"
+    return f"{last_name} {first_name}"
+
+
+def full_name_expression(employee=Employee):
+    """
+    Normalized "last first patronymic" of Employee or its alias.
+
+    Indexed by idx_emp_full_name_trgm, so filters must use exactly this
+    expression. Separators are SQL literals, not bound parameters, for the
+    same reason.
+    """
+    return func.lower(
+        employee.last_name
+        + literal_column("' '")
+        + employee.first_name
+        + literal_column("' '")
+        + func.coalesce(employee.patronymic, literal_column("''"))
+    )
+
+
+# Substring search over full name (LIKE '%...%'), requires pg_trgm extension
+Index(
+    "idx_emp_full_name_trgm",
+    full_name_expression().label("full_name"),
+    postgresql_using="gin",
+    postgresql_ops={"full_name": "gin_trgm_ops"},
+)
+
+
 @event.listens_for(Session, "before_flush")
 def validate_employee_relations(session, flush_context, instances):
-    for obj in session.new.union(session.dirty):
-        if not isinstance(obj, Employee):
-            continue
-
-        # Check for required fields
+    """
+    Checks positions and managers of all new and changed employees.
+
+    Positions and managers of the whole flush are loaded with one IN query
+    each, so cost depends on number of flushes, not of employees. Entities
+    already in session are taken as they are, so an employee may refer to
+    a manager changed in the same flush.
+    """
+    employees = [
+        obj
+        for obj in (*session.new, *session.dirty)
+        if isinstance(obj, Employee)
+    ]
+    if not employees:
+        return
+
+    # Check for required fields
+    for obj in employees:
         if not obj.position_id:
             msg = messages['errors']['validation']['emp_position']
             raise ValueError(msg)
-            
-        # Get position from database directly
-        position = session.get(Position, obj.position_id)
+
+    with session.no_autoflush:
+        manager_ids = {obj.manager_id for obj in employees if obj.manager_id}
+        managers = {}
+        if manager_ids:
+            managers = {
+                manager.id: manager
+                for manager in session.scalars(
+                    select(Employee).where(Employee.id.in_(manager_ids))
+                )
+            }
+        position_ids = {obj.position_id for obj in employees}
+        position_ids.update(manager.position_id for manager in managers.values())
+        positions = {
+            position.id: position
+            for position in session.scalars(
+                select(Position).where(Position.id.in_(position_ids))
+            )
+        }
+
+    for obj in employees:
+        position = positions.get(obj.position_id)
         if not position:
-            msg = messages['errors']['validation']['emp_position_id']            
+            msg = messages['errors']['validation']['emp_position_id']
             raise ValueError(msg.format(id=obj.position_id))
 
         # CEO validation
         if position.level == 1:
             if obj.manager_id:
-                msg = messages['errors']['validation']['emp_position_id']            
+                msg = messages['errors']['validation']['emp_ceo_mngr']
                 raise ValueError(msg)
-            return
+            continue
 
         # Manager validation for other levels
         if not obj.manager_id:
-            msg = messages['errors']['validation']['employee_have_no_manager']            
+            msg = messages['errors']['validation']['employee_have_no_manager']
             raise ValueError(msg.format(employee=obj))
-            
-        # Get manager from database
-        manager = session.get(Employee, obj.manager_id)
+
+        manager = managers.get(obj.manager_id)
         if not manager:
-            msg = messages['errors']['validation']['emp_mngr_id']            
+            msg = messages['errors']['validation']['emp_mngr_id']
             raise ValueError(msg.format(id=obj.manager_id))
-            
-        # Get manager's position
-        manager_position = session.get(Position, manager.position_id)
+
+        manager_position = positions.get(manager.position_id)
         if not manager_position:
-            msg = messages['errors']['validation']['emp_mngr_position']            
+            msg = messages['errors']['validation']['empl_mngr_position']
             raise ValueError(msg.format(id=manager.id))
-            
+
         # Hierarchy check
         if manager_position.level >= position.level:
-            msg = messages['errors']['validation']['manager_level']            
+            msg = messages['errors']['validation']['manager_level']
             raise ValueError(msg.format(manager=manager, employee=obj))
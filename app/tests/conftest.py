@@ -0,0 +1,39 @@
+import sys
+from pathlib import Path
+
+import psycopg
+import pytest
+
+# Modules of the application are imported from app directory, as main.py does
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.settings import settings  # noqa: E402
+
+
+def database_available() -> bool:
+    try:
+        psycopg.connect(
+            dbname=settings.DB_NAME,
+            user=settings.DB_USER,
+            password=settings.DB_PASSWORD,
+            host=settings.DB_HOST,
+            port=settings.DB_PORT,
+            connect_timeout=3,
+        ).close()
+    except psycopg.Error:
+        return False
+    return True
+
+
+@pytest.fixture(scope="session")
+def catalog():
+    """
+    Shared EmployeeCatalog. Importing core.database connects to the
+    configured PostgreSQL database, so tests using it are skipped if the
+    database is not reachable.
+    """
+    if not database_available():
+        pytest.skip("PostgreSQL is not available")
+    from core.database import employee_catalog
+
+    return employee_catalog
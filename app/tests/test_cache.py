@@ -0,0 +1,87 @@
+import pytest
+from core import cache
+from core.cache import QueryCache, freeze
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_hit_and_miss_counters(clock):
+    results = QueryCache(maxsize=4, ttl=10)
+    assert results.get("a") == (False, None)
+    results.set("a", [1])
+    assert results.get("a") == (True, [1])
+    assert results.get("b") == (False, None)
+    assert results.stats() == {
+        "hits": 1,
+        "misses": 2,
+        "size": 1,
+        "maxsize": 4,
+        "ttl": 10,
+    }
+
+
+def test_ttl_expiry(clock):
+    results = QueryCache(maxsize=4, ttl=10)
+    results.set("a", 1)
+    clock[0] += 9.9
+    assert results.get("a") == (True, 1)
+    clock[0] += 0.1
+    assert results.get("a") == (False, None)
+    assert results.stats()["size"] == 0
+
+
+def test_set_renews_ttl(clock):
+    results = QueryCache(maxsize=4, ttl=10)
+    results.set("a", 1)
+    clock[0] += 8
+    results.set("a", 2)
+    clock[0] += 8
+    assert results.get("a") == (True, 2)
+
+
+def test_lru_eviction(clock):
+    results = QueryCache(maxsize=2, ttl=10)
+    results.set("a", 1)
+    results.set("b", 2)
+    # Reading "a" makes "b" least recently used
+    assert results.get("a") == (True, 1)
+    results.set("c", 3)
+    assert results.get("b") == (False, None)
+    assert results.get("a") == (True, 1)
+    assert results.get("c") == (True, 3)
+    assert results.stats()["size"] == 2
+
+
+def test_zero_size_disables_cache(clock):
+    results = QueryCache(maxsize=0, ttl=10)
+    results.set("a", 1)
+    assert results.get("a") == (False, None)
+
+
+def test_clear_keeps_counters(clock):
+    results = QueryCache(maxsize=4, ttl=10)
+    results.set("a", 1)
+    results.set("b", 2)
+    results.get("a")
+    results.get("x")
+    results.clear()
+    assert results.get("a") == (False, None)
+    assert results.get("b") == (False, None)
+    assert results.stats()["hits"] == 1
+    assert results.stats()["misses"] == 3
+    assert results.stats()["size"] == 0
+
+
+def test_freeze_normalizes_options():
+    options = [{"field": "date", "op": "between", "value": ["2020", "2022"]}]
+    key = freeze(options)
+    assert hash(key) == hash(freeze(options))
+    reordered = [{"value": ("2020", "2022"), "op": "between", "field": "date"}]
+    assert key == freeze(reordered)
+    other = [{"field": "date", "op": "between", "value": ["2020", "2023"]}]
+    assert key != freeze(other)
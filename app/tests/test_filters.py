@@ -0,0 +1,118 @@
+"""
+Range filters of get_employees_page(): date prefixes and the half-open
+predicates they compile into.
+"""
+
+from datetime import date
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+
+def sql(clause) -> str:
+    compiled = clause.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    return " ".join(str(compiled).split())
+
+
+@pytest.fixture
+def hire_date():
+    from employees.models import Employee
+
+    return Employee.hire_date
+
+
+@pytest.fixture
+def salary():
+    from employees.models import Employee
+
+    return Employee.salary
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("2023", (date(2023, 1, 1), date(2024, 1, 1))),
+        ("2023-02", (date(2023, 2, 1), date(2023, 3, 1))),
+        ("2023-12", (date(2023, 12, 1), date(2024, 1, 1))),
+        ("2023-2-28", (date(2023, 2, 28), date(2023, 3, 1))),
+        ("2024-12-31", (date(2024, 12, 31), date(2025, 1, 1))),
+    ],
+)
+def test_date_range(catalog, value, expected):
+    assert catalog._date_range(value) == expected
+
+
+@pytest.mark.parametrize("value", ["20", "202", "20234", "abcd", "", " 2023"])
+def test_date_range_rejects_bad_year(catalog, value):
+    with pytest.raises(ValueError, match="Use 4-digit year"):
+        catalog._date_range(value)
+
+
+@pytest.mark.parametrize(
+    "value",
+    ["2023-", "2023-13", "2023-02-30", "2023-1-1-1", "23-01-01", "2023-001", "0000"],
+)
+def test_date_range_rejects_bad_date(catalog, value):
+    with pytest.raises(ValueError, match="Incorrect date format"):
+        catalog._date_range(value)
+
+
+@pytest.mark.parametrize(
+    "op, value, expected",
+    [
+        (
+            "=",
+            "2023",
+            "employees.hire_date >= '2023-01-01' "
+            "AND employees.hire_date < '2024-01-01'",
+        ),
+        (">", "2023", "employees.hire_date >= '2024-01-01'"),
+        (">=", "2023-05", "employees.hire_date >= '2023-05-01'"),
+        ("<", "2023-05", "employees.hire_date < '2023-05-01'"),
+        ("<=", "2023-05-31", "employees.hire_date < '2023-06-01'"),
+        (
+            "between",
+            ("2020", "2022-06"),
+            "employees.hire_date >= '2020-01-01' "
+            "AND employees.hire_date < '2022-07-01'",
+        ),
+        ("between", ("2020", ""), "employees.hire_date >= '2020-01-01'"),
+        ("between", ("", "2022"), "employees.hire_date < '2023-01-01'"),
+    ],
+)
+def test_date_filter(catalog, hire_date, op, value, expected):
+    clause = catalog._range_filter(hire_date, op, value, catalog._date_range)
+    assert sql(clause) == expected
+
+
+@pytest.mark.parametrize(
+    "op, value, expected",
+    [
+        ("=", "100000", "employees.salary = 100000"),
+        (">", "100000", "employees.salary > 100000"),
+        ("<=", "100000.5", "employees.salary <= 100000.5"),
+        (
+            "between",
+            ("100000", "150000"),
+            "employees.salary >= 100000 AND employees.salary <= 150000",
+        ),
+        ("between", ("100000", ""), "employees.salary >= 100000"),
+        ("between", ("", "150000"), "employees.salary <= 150000"),
+    ],
+)
+def test_salary_filter(catalog, salary, op, value, expected):
+    clause = catalog._range_filter(salary, op, value, catalog._salary_range)
+    assert sql(clause) == expected
+
+
+def test_range_filter_errors(catalog, hire_date, salary):
+    with pytest.raises(ValueError, match="Empty range"):
+        catalog._range_filter(hire_date, "between", ("", ""), catalog._date_range)
+    with pytest.raises(ValueError, match="Unknown operator"):
+        catalog._range_filter(hire_date, "!=", "2023", catalog._date_range)
+    with pytest.raises(ValueError, match="Use 4-digit year"):
+        catalog._range_filter(hire_date, "between", ("20", ""), catalog._date_range)
+    with pytest.raises(ValueError):
+        catalog._range_filter(salary, ">", "lots", catalog._salary_range)
@@ -0,0 +1,67 @@
+from core.hierarchy import build_tree, children_index
+
+
+def nodes(*pairs) -> list:
+    return [
+        {"id": id, "manager_id": manager_id, "subordinates": []}
+        for id, manager_id in pairs
+    ]
+
+
+def shape(node) -> tuple:
+    return node["id"], [shape(child) for child in node["subordinates"]]
+
+
+def test_children_index():
+    by_id, children = children_index(nodes((1, None), (3, 1), (2, 1), (4, 3)))
+    assert sorted(by_id) == [1, 2, 3, 4]
+    assert [node["id"] for node in children[1]] == [3, 2]
+    assert [node["id"] for node in children[None]] == [1]
+    assert 4 not in children
+
+
+def test_children_are_ordered_by_id():
+    tree = build_tree(nodes((5, 1), (1, None), (3, 1), (4, 3), (2, 3)), 1, 10)
+    assert shape(tree) == (1, [(3, [(2, []), (4, [])]), (5, [])])
+
+
+def test_limit_is_taken_breadth_first():
+    rows = nodes((1, None), (2, 1), (3, 1), (4, 2), (5, 3), (6, 4))
+    assert shape(build_tree(rows, 1, 3)) == (1, [(2, [(4, [])]), (3, [])])
+    rows = nodes((1, None), (2, 1), (3, 1), (4, 2), (5, 3), (6, 4))
+    assert shape(build_tree(rows, 1, 0)) == (1, [])
+
+
+def test_subtree_of_inner_node():
+    rows = nodes((1, None), (2, 1), (3, 2), (4, 1))
+    assert shape(build_tree(rows, 2, 10)) == (2, [(3, [])])
+
+
+def test_missing_root():
+    assert build_tree(nodes((1, None), (2, 1)), 7, 10) == {}
+    assert build_tree([], 1, 10) == {}
+
+
+def test_orphans_are_left_out():
+    # 5 reports to 9, which is not among the nodes
+    rows = nodes((1, None), (2, 1), (5, 9), (6, 5))
+    assert shape(build_tree(rows, 1, 10)) == (1, [(2, [])])
+
+
+def test_cycles_do_not_loop():
+    # 2 -> 3 -> 4 -> 2 below root, and root itself listed under 4
+    rows = nodes((1, 4), (2, 1), (3, 2), (4, 3), (2, 4))
+    assert shape(build_tree(rows, 1, 10)) == (1, [(2, [(3, [(4, [])])])])
+
+
+def test_cycle_without_root_path():
+    # 7 and 8 manage each other, nothing links them to root
+    rows = nodes((1, None), (2, 1), (7, 8), (8, 7))
+    assert shape(build_tree(rows, 1, 10)) == (1, [(2, [])])
+    assert shape(build_tree(nodes((7, 8), (8, 7)), 7, 10)) == (7, [(8, [])])
+
+
+def test_duplicated_rows_are_kept_once():
+    rows = nodes((1, None), (2, 1), (2, 1), (3, 2))
+    tree = build_tree(rows, 1, 10)
+    assert shape(tree) == (1, [(2, [(3, [])])])
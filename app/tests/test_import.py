@@ -0,0 +1,56 @@
+"""
+Value checks of import_employees() staging rows, run by the
+employee_import_value_error() function of the configured database.
+"""
+
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import text
+
+TOMORROW = (date.today() + timedelta(days=1)).isoformat()
+
+
+@pytest.fixture
+def conn(catalog):
+    with catalog.engine.connect() as conn:
+        yield conn
+
+
+def value_error(conn, hire_date, salary):
+    return conn.scalar(
+        text("SELECT employee_import_value_error(:hire_date, :salary)"),
+        {"hire_date": hire_date, "salary": salary},
+    )
+
+
+@pytest.mark.parametrize(
+    "hire_date, salary",
+    [
+        ("2020-01-01", "100"),
+        ("2020-01-01", "0.01"),
+        (" 2024-02-29 ", "99999999.99"),
+        (date.today().isoformat(), "150000.50"),
+    ],
+)
+def test_valid_values(conn, hire_date, salary):
+    assert value_error(conn, hire_date, salary) is None
+
+
+@pytest.mark.parametrize(
+    "hire_date",
+    [None, "", "2023-02-29", "2020-13-01", "2020-1-1", "01.02.2020", "today", TOMORROW],
+)
+def test_bad_hire_date(conn, hire_date):
+    assert value_error(conn, hire_date, "100") == "hire_date"
+
+
+@pytest.mark.parametrize(
+    "salary", [None, "", "0", "-5", "lots", "1e", "100000000", "1,000"]
+)
+def test_bad_salary(conn, salary):
+    assert value_error(conn, "2020-01-01", salary) == "salary"
+
+
+def test_hire_date_is_checked_first(conn):
+    assert value_error(conn, "never", "-1") == "hire_date"
@@ -0,0 +1,75 @@
+"""
+Triggers maintaining employees.org_path, run against the configured
+PostgreSQL database inside a scratch schema which is rolled back.
+Skipped if the database is not reachable.
+"""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+
+@pytest.fixture
+def conn(catalog):
+    from core.database import SQL_BULK_LOAD_SETUP, SQL_ORG_PATH_SETUP
+
+    with catalog.engine.connect() as conn:
+        conn.execute(text("CREATE SCHEMA org_path_test"))
+        conn.execute(text("SET LOCAL search_path = org_path_test, public"))
+        conn.execute(
+            text(
+                """
+                CREATE TABLE employees (
+                    id int PRIMARY KEY,
+                    manager_id int REFERENCES employees (id),
+                    org_path ltree
+                )
+                """
+            )
+        )
+        conn.execute(SQL_BULK_LOAD_SETUP)
+        for statement in SQL_ORG_PATH_SETUP:
+            conn.execute(statement)
+        conn.execute(
+            text(
+                "INSERT INTO employees (id, manager_id) "
+                "VALUES (1, NULL), (2, 1), (3, 2), (4, 1)"
+            )
+        )
+        yield conn
+        conn.rollback()
+
+
+def paths(conn) -> dict:
+    rows = conn.execute(text("SELECT id, org_path::text FROM employees"))
+    return dict(rows.all())
+
+
+def update_manager(conn, id: int, manager_id: int | None):
+    conn.execute(
+        text("UPDATE employees SET manager_id = :manager_id WHERE id = :id"),
+        {"id": id, "manager_id": manager_id},
+    )
+
+
+def test_paths_on_insert(conn):
+    assert paths(conn) == {1: "1", 2: "1.2", 3: "1.2.3", 4: "1.4"}
+
+
+def test_same_manager_written_back(conn):
+    update_manager(conn, 2, 1)
+    update_manager(conn, 1, None)
+    assert paths(conn) == {1: "1", 2: "1.2", 3: "1.2.3", 4: "1.4"}
+
+
+def test_move_reroots_subtree(conn):
+    update_manager(conn, 2, 4)
+    assert paths(conn) == {1: "1", 2: "1.4.2", 3: "1.4.2.3", 4: "1.4"}
+
+
+@pytest.mark.parametrize("id, manager_id", [(1, 3), (2, 3), (2, 2)])
+def test_cycle_is_rejected(conn, id, manager_id):
+    with pytest.raises(DBAPIError, match="cannot report to own subordinate"):
+        with conn.begin_nested():
+            update_manager(conn, id, manager_id)
+    assert paths(conn) == {1: "1", 2: "1.2", 3: "1.2.3", 4: "1.4"}
@@ -0,0 +1,156 @@
+import random
+
+import numpy as np
+import pytest
+from core.orgindex import OrgIndex
+
+# 1 ── 2 ── 10
+#   └─ 3 ── 5
+#        └─ 6
+ROWS = [(1, None, 1), (2, 1, 2), (3, 1, 2), (10, 2, 3), (5, 3, 3), (6, 3, 3)]
+
+
+@pytest.fixture
+def index() -> OrgIndex:
+    return OrgIndex.from_rows(ROWS)
+
+
+def sql_order(rows, root_id, limit=None, max_depth=None) -> list:
+    """(id, depth) rows as STMT_HIERARCHY returns them: by depth, then ID"""
+    managers = {id: manager_id for id, manager_id, _ in rows}
+
+    def depth(id):
+        result = 0
+        while id != root_id:
+            id = managers[id]
+            if id is None:
+                return None
+            result += 1
+        return result
+
+    subtree = [(id, depth(id)) for id in managers]
+    subtree = sorted(
+        ((id, d) for id, d in subtree if d is not None), key=lambda row: row[::-1]
+    )
+    if max_depth is not None:
+        subtree = [(id, d) for id, d in subtree if d <= max_depth]
+    return subtree if limit is None else subtree[: limit + 1]
+
+
+def test_csr_layout(index):
+    assert index.parent[[1, 2, 3, 5, 6, 10]].tolist() == [-1, 1, 1, 3, 3, 2]
+    assert index.level[[1, 2, 3, 4, 5, 6, 10]].tolist() == [1, 2, 2, 0, 3, 3, 3]
+    for manager_id, subordinates in {1: [2, 3], 2: [10], 3: [5, 6], 5: []}.items():
+        start, end = index.offsets[manager_id], index.offsets[manager_id + 1]
+        assert index.children[start:end].tolist() == subordinates
+    assert index.offsets[-1] == len(index.children) == 5
+    assert len(index) == 6
+    assert 4 not in index and 10 in index and 99 not in index
+
+
+def test_queries(index):
+    assert index.manager(1) is None
+    assert index.manager(10) == 2
+    assert index.manager(99) is None
+    assert index.subordinates(3) == [5, 6]
+    assert index.ancestors(10) == [2, 1]
+    assert index.ancestors(99) == []
+    assert index.depth(6) == 2
+    assert index.subtree_size(1) == 5
+    assert index.subtree_size(3) == 2
+    assert index.subtree_size(99) == 0
+
+
+@pytest.mark.parametrize("limit", [None, 0, 1, 2, 3, 4, 5])
+@pytest.mark.parametrize("max_depth", [None, 0, 1, 2])
+def test_subtree_matches_sql_order(index, limit, max_depth):
+    assert index.subtree(1, limit=limit, max_depth=max_depth) == sql_order(
+        ROWS, 1, limit=limit, max_depth=max_depth
+    )
+
+
+def test_subtree_cut_by_limit_is_ordered_by_id_per_level(index):
+    # 5 (under 3) precedes 10 (under 2) on the second level
+    assert index.subtree(1, limit=3) == [(1, 0), (2, 1), (3, 1), (5, 2)]
+
+
+def test_subtree_of_random_chart():
+    rng = random.Random(0)
+    rows = [(1, None, 1)]
+    for id in rng.sample(range(2, 5000), 2000):
+        rows.append((id, rng.choice(rows)[0], 2))
+    index = OrgIndex.from_rows(rows)
+    for root_id in (1, rows[10][0], rows[500][0]):
+        for limit in (0, 7, 100, None):
+            assert index.subtree(root_id, limit=limit) == sql_order(
+                rows, root_id, limit=limit
+            )
+
+
+def test_add_goes_to_overlay(index):
+    children = index.children.copy()
+    index.add(20, 2, 3)
+    index.add(4, 20, 4)
+    assert np.array_equal(index.children, children)
+    assert index._added == {2: [20], 20: [4]}
+    assert index.subordinates(2) == [10, 20]
+    assert index.ancestors(4) == [20, 2, 1]
+    assert index.subtree_size(2) == 3
+    assert index.subtree(1, limit=5) == [
+        (1, 0), (2, 1), (3, 1), (5, 2), (6, 2), (10, 2)
+    ]
+    assert index.subtree(2) == [(2, 0), (10, 1), (20, 1), (4, 2)]
+
+
+def test_add_grows_arrays(index):
+    index.add(1000, 1, 2)
+    assert len(index.parent) > 1000 and len(index.level) == len(index.parent)
+    assert index.subordinates(1) == [2, 3, 1000]
+    assert index.subtree_size(1) == 6
+
+
+def test_move_to_other_manager(index):
+    index.move(3, 2, 3)
+    assert index.subordinates(1) == [2]
+    assert index.subordinates(2) == [3, 10]
+    assert index.ancestors(5) == [3, 2, 1]
+    assert index.subtree_size(2) == 4
+    assert index.subtree(1) == [(1, 0), (2, 1), (3, 2), (10, 2), (5, 3), (6, 3)]
+
+
+def test_move_back_is_not_duplicated(index):
+    index.move(5, 2, 3)
+    index.move(5, 3, 3)
+    assert index.subordinates(3) == [5, 6]
+    assert index.subordinates(2) == [10]
+    assert index.subtree_size(1) == 5
+    assert index.subtree(3) == [(3, 0), (5, 1), (6, 1)]
+
+
+def test_move_to_same_manager_changes_level_only(index):
+    index.move(10, 2, 4)
+    assert index.level[10] == 4
+    assert index._added == {} and index._patches == 0
+
+
+def test_remove(index):
+    index.remove(6)
+    assert 6 not in index
+    assert index.subordinates(3) == [5]
+    assert index.subtree_size(1) == 4
+    assert index.subtree(6) == []
+    index.remove(6)
+    assert index._patches == 1
+
+
+def test_rebuild_after_threshold(index, monkeypatch):
+    monkeypatch.setattr(OrgIndex, "REBUILD_THRESHOLD", 3)
+    index.add(20, 2, 3)
+    index.move(6, 2, 3)
+    assert index._patches == 2 and index._added
+    index.remove(5)
+    assert index._patches == 0 and not index._added
+    for manager_id, subordinates in {1: [2, 3], 2: [6, 10, 20], 3: []}.items():
+        start, end = index.offsets[manager_id], index.offsets[manager_id + 1]
+        assert index.children[start:end].tolist() == subordinates
+    assert index.subtree(1) == [(1, 0), (2, 1), (3, 1), (6, 2), (10, 2), (20, 2)]
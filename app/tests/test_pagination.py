@@ -0,0 +1,165 @@
+"""
+Keyset pagination of get_employees_page(): cursors and seek predicates.
+Predicates run against a scratch employees table full of ties on every
+sort key, created in a schema which is rolled back.
+"""
+
+import base64
+import json
+from datetime import date
+from decimal import Decimal
+from itertools import product
+
+import pytest
+from sqlalchemy import select, text
+
+SORTS = {
+    "salary": [{"order_field": "salary", "descending": False}],
+    "salary desc": [{"order_field": "salary", "descending": True}],
+    "date, name": [
+        {"order_field": "date", "descending": False},
+        {"order_field": "name", "descending": False},
+    ],
+    "date desc, name desc": [
+        {"order_field": "date", "descending": True},
+        {"order_field": "name", "descending": True},
+    ],
+    "salary desc, date": [
+        {"order_field": "salary", "descending": True},
+        {"order_field": "date", "descending": False},
+    ],
+    "id": [],
+}
+
+
+def sort_keys(catalog, sort_opts) -> list:
+    from core.database import ListManager, ListPosition
+
+    return catalog._sort_keys(sort_opts, ListPosition, ListManager)
+
+
+def encoded(data) -> str:
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+
+
+@pytest.fixture
+def conn(catalog):
+    with catalog.engine.connect() as conn:
+        conn.execute(text("CREATE SCHEMA pagination_test"))
+        conn.execute(text("SET LOCAL search_path = pagination_test, public"))
+        conn.execute(
+            text(
+                """
+                CREATE TABLE employees (
+                    id int PRIMARY KEY,
+                    last_name text NOT NULL,
+                    first_name text NOT NULL,
+                    patronymic text,
+                    hire_date date NOT NULL,
+                    salary numeric(10, 2) NOT NULL
+                )
+                """
+            )
+        )
+        # Every combination twice, so every key has ties
+        values = product(
+            ["Ivanov", "Petrov"],
+            ["Anna", "Boris"],
+            [None, "Ilyich"],
+            [date(2020, 1, 1), date(2021, 6, 1)],
+            [Decimal("100.00"), Decimal("250.50")],
+            range(2),
+        )
+        conn.execute(
+            text(
+                "INSERT INTO employees "
+                "VALUES (:id, :last, :first, :patronymic, :hired, :salary)"
+            ),
+            [
+                dict(
+                    zip(("last", "first", "patronymic", "hired", "salary"), row),
+                    id=id,
+                )
+                for id, row in enumerate(values, start=1)
+            ],
+        )
+        yield conn
+        conn.rollback()
+
+
+@pytest.mark.parametrize("sort", SORTS)
+def test_cursor_round_trip(catalog, sort):
+    keys = sort_keys(catalog, SORTS[sort])
+    sample = {
+        date: date(2021, 6, 1),
+        Decimal: Decimal("250.50"),
+        str: "Petrov",
+        int: 42,
+    }
+    values = [sample[key.type.python_type] for key, _ in keys]
+    cursor = catalog._encode_cursor(values)
+    assert "=" not in cursor and "/" not in cursor and "+" not in cursor
+    assert catalog._decode_cursor(cursor, keys) == values
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "",
+        "not a cursor",
+        "!!!!",
+        encoded(["100.00"]),
+        encoded(["100.00", "1", "2"]),
+        encoded({"salary": "100.00", "id": "1"}),
+        encoded("100.00"),
+        encoded(["lots", "1"]),
+        encoded(["100.00", "one"]),
+        encoded(["100.00", "1.5"]),
+        encoded([None, "1"]),
+        base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+    ],
+)
+def test_tampered_cursor_is_rejected(catalog, cursor):
+    keys = sort_keys(catalog, SORTS["salary"])
+    with pytest.raises(ValueError, match="Invalid page cursor"):
+        catalog._decode_cursor(cursor, keys)
+
+
+def test_cursor_of_other_sort_is_rejected(catalog):
+    cursor = catalog._encode_cursor(["2020-01-01", "Ivanov", "Anna", "", "1"])
+    keys = sort_keys(catalog, SORTS["salary desc, date"])
+    with pytest.raises(ValueError, match="Invalid page cursor"):
+        catalog._decode_cursor(cursor, keys)
+
+
+def test_uniform_direction_compares_row_values(catalog):
+    keys = sort_keys(catalog, SORTS["salary desc"])
+    predicate = catalog._keyset_predicate(keys, [Decimal(1), 1], backward=False)
+    assert str(predicate).startswith("(employees.salary, employees.id) <")
+
+
+@pytest.mark.parametrize("sort", SORTS)
+def test_keyset_predicate_seeks_through_ties(catalog, conn, sort):
+    keys = sort_keys(catalog, SORTS[sort])
+
+    def fetch(*where, backward=False):
+        stmt = (
+            select(*[key for key, _ in keys])
+            .where(*where)
+            .order_by(
+                *[
+                    key.desc() if descending != backward else key.asc()
+                    for key, descending in keys
+                ]
+            )
+        )
+        return [tuple(row) for row in conn.execute(stmt)]
+
+    rows = fetch()
+    assert len(rows) == 64
+    for i, row in enumerate(rows):
+        values = catalog._decode_cursor(catalog._encode_cursor(row), keys)
+        after = catalog._keyset_predicate(keys, values, backward=False)
+        assert fetch(after) == rows[i + 1 :]
+        before = catalog._keyset_predicate(keys, values, backward=True)
+        assert fetch(before, backward=True) == rows[:i][::-1]
@@ -0,0 +1,126 @@
+import io
+from types import SimpleNamespace
+
+from core.cli.localization import messages
+from core.cli.views import iter_hierarchy_lines, print_hierarchy
+
+TREE = messages["ui"]["views"]["tree"]
+
+
+def node(name: str, *subordinates) -> dict:
+    return {"full_name": name, "position": "P", "subordinates": list(subordinates)}
+
+
+def chart() -> dict:
+    #   A
+    #   ├── B
+    #   │   ├── D
+    #   │   │   └── G
+    #   │   ├── E
+    #   │   └── F
+    #   └── C
+    return node(
+        "A",
+        node("B", node("D", node("G")), node("E"), node("F")),
+        node("C"),
+    )
+
+
+def test_full_tree():
+    assert list(iter_hierarchy_lines(chart())) == [
+        "A (P)",
+        "├── B (P)",
+        "│   ├── D (P)",
+        "│   │   └── G (P)",
+        "│   ├── E (P)",
+        "│   └── F (P)",
+        "└── C (P)",
+    ]
+
+
+def test_depth_limit():
+    assert list(iter_hierarchy_lines(chart(), max_depth=1)) == [
+        "A (P)",
+        "├── B (P)",
+        "│   └── " + TREE["hidden"].format(n=3),
+        "└── C (P)",
+    ]
+    assert list(iter_hierarchy_lines(chart(), max_depth=2)) == [
+        "A (P)",
+        "├── B (P)",
+        "│   ├── D (P)",
+        "│   │   └── " + TREE["hidden"].format(n=1),
+        "│   ├── E (P)",
+        "│   └── F (P)",
+        "└── C (P)",
+    ]
+
+
+def test_depth_zero_draws_root_only():
+    assert list(iter_hierarchy_lines(chart(), max_depth=0)) == [
+        "A (P)",
+        "└── " + TREE["hidden"].format(n=2),
+    ]
+
+
+def test_collapse_of_siblings():
+    assert list(iter_hierarchy_lines(chart(), max_siblings=1)) == [
+        "A (P)",
+        "├── B (P)",
+        "│   ├── D (P)",
+        "│   │   └── G (P)",
+        "│   └── " + TREE["more"].format(n=2),
+        "└── " + TREE["more"].format(n=1),
+    ]
+
+
+def test_collapse_with_depth_limit():
+    assert list(iter_hierarchy_lines(chart(), max_depth=1, max_siblings=1)) == [
+        "A (P)",
+        "├── B (P)",
+        "│   └── " + TREE["hidden"].format(n=3),
+        "└── " + TREE["more"].format(n=1),
+    ]
+
+
+def test_zero_siblings_collapses_everything():
+    assert list(iter_hierarchy_lines(chart(), max_siblings=0)) == [
+        "A (P)",
+        "└── " + TREE["more"].format(n=2),
+    ]
+
+
+def test_limits_above_size_change_nothing():
+    full = list(iter_hierarchy_lines(chart()))
+    assert list(iter_hierarchy_lines(chart(), max_depth=3, max_siblings=3)) == full
+
+
+def test_rollup_annotation():
+    root = chart()
+    root["rollup"] = SimpleNamespace(headcount=7, payroll=700, average_salary=100)
+    first = next(iter_hierarchy_lines(root))
+    assert first == "A (P) " + TREE["rollup"].format(
+        headcount=7, payroll=700, average=100
+    )
+
+
+def test_deep_chain_is_not_recursive():
+    root = current = node("0")
+    for i in range(1, 5000):
+        current["subordinates"].append(node(str(i)))
+        current = current["subordinates"][0]
+    lines = list(iter_hierarchy_lines(root))
+    assert len(lines) == 5000
+    assert lines[-1] == " " * 4 * 4998 + "└── 4999 (P)"
+
+
+def test_print_hierarchy():
+    out = io.StringIO()
+    print_hierarchy(chart(), max_depth=1, file=out)
+    assert out.getvalue().splitlines() == [
+        *iter_hierarchy_lines(chart(), max_depth=1),
+        " ...",
+    ]
+    out = io.StringIO()
+    print_hierarchy({}, file=out)
+    assert out.getvalue() == messages["errors"]["cli"]["empty_hierarchy"] + "\n"